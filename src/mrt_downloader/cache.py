@@ -2,6 +2,7 @@
 
 import asyncio
 import datetime
+import functools
 import logging
 import sqlite3
 from collections.abc import Awaitable, Callable
@@ -593,9 +594,12 @@ async def get_cached_indexes_batch(
         return {}
 
 
+@functools.lru_cache(maxsize=1024)
 def get_month_end_date(year: int, month: int) -> datetime.datetime:
     """Get the last moment of a given month (last day at 23:59:59).
 
+    Results are cached; the returned datetime is immutable.
+
     Args:
         year: The year
         month: The month (1-12)
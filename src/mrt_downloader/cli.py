@@ -21,6 +21,7 @@ from mrt_downloader.files import (
     PrefixCollectorByHourStrategy,
     PrefixCollectorStrategy,
 )
+from mrt_downloader.http import DEFAULT_MAX_CONNECTIONS_PER_HOST
 
 LOG = logging.getLogger(__name__)  #
 logging.basicConfig(level=logging.INFO)
@@ -95,6 +96,20 @@ CLICK_DATETIME_TYPE = click.DateTime(
     ),
     help="Number of download worker threads (default: min(16, #cores). override using MRT_DOWNLOADER_PARALLELISM)",
 )
+@click.option(
+    "--max-connections-per-host",
+    type=int,
+    default=DEFAULT_MAX_CONNECTIONS_PER_HOST,
+    show_default=True,
+    help="Maximum number of concurrent connections per collector host",
+)
+@click.option(
+    "--assume-immutable-after",
+    type=click.IntRange(min=0),
+    default=None,
+    metavar="DAYS",
+    help="Do not check already downloaded files that are older than this many days with the server",
+)
 @click.option(
     "--force-cache-refresh",
     is_flag=True,
@@ -117,6 +132,8 @@ def cli(
     rib_only: bool | None = None,
     bview_only: bool | None = None,
     force_cache_refresh: bool = False,
+    max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+    assume_immutable_after: int | None = None,
 ):
     """
     Download a set of BGP updates from RIS.
@@ -243,6 +260,12 @@ def cli(
             naming_strategy=naming_strategy,
             project=frozenset(project),
             force_cache_refresh=force_cache_refresh,
+            max_per_host=max_connections_per_host,
+            assume_immutable_after=(
+                datetime.timedelta(days=assume_immutable_after)
+                if assume_immutable_after is not None
+                else None
+            ),
         )
     )
 
@@ -4,7 +4,7 @@ import os
 import urllib
 import urllib.parse
 from html.parser import HTMLParser
-from typing import Iterable
+from typing import Iterable, Literal
 
 import aiohttp
 import click
@@ -19,6 +19,19 @@ from mrt_downloader.models import (
 
 LOG = logging.getLogger(__name__)
 
+# File type by the first component of an MRT filename (e.g. updates.20250501.0000.gz)
+FILE_TYPE_BY_PREFIX: dict[str, Literal["rib", "update"]] = {
+    "bview": "rib",
+    "view": "rib",
+    "rib": "rib",
+    "updates": "update",
+}
+
+# Shared file type sets for index entries, reused instead of built per entry
+FILE_TYPES_RIB: frozenset[Literal["rib", "update"]] = frozenset(("rib",))
+FILE_TYPES_UPDATE: frozenset[Literal["rib", "update"]] = frozenset(("update",))
+FILE_TYPES_BOTH: frozenset[Literal["rib", "update"]] = frozenset(("rib", "update"))
+
 # This constant will be removed on or after 2025-11-01
 BASE_URL_TEMPLATE = "https://data.ris.ripe.net/rrc{rrc:02}/{year:04}.{month:02}/"
 
@@ -73,13 +86,13 @@ def index_files_for_collector(
                                 collector=collector,
                                 url=f"{collector.base_url}{now.year:04}.{now.month:02}/RIBS/",
                                 time_period=now,
-                                file_types=frozenset(["rib"]),
+                                file_types=FILE_TYPES_RIB,
                             ),
                             CollectorIndexEntry(
                                 collector=collector,
                                 url=f"{collector.base_url}{now.year:04}.{now.month:02}/UPDATES/",
                                 time_period=now,
-                                file_types=frozenset(["update"]),
+                                file_types=FILE_TYPES_UPDATE,
                             ),
                         ]
                     )
@@ -90,7 +103,7 @@ def index_files_for_collector(
                             collector=collector,
                             url=f"{collector.base_url}{now.year:04}.{now.month:02}/",
                             time_period=now,
-                            file_types=frozenset(["rib", "update"]),
+                            file_types=FILE_TYPES_BOTH,
                         )
                     )
 
@@ -102,54 +115,74 @@ def index_files_for_collector(
     return index_urls
 
 
-def process_index_entry(
-    index: CollectorIndexEntry, html: str
-) -> list[CollectorFileEntry]:
-    """Extract the relevant files from the collector index entry."""
-    result: list[CollectorFileEntry] = []
-    parser = AnchorTagParser()
-    parser.feed(html)
+class IndexEntryParser:
+    """
+    Incrementally extract the relevant files from a collector index.
+
+    The index HTML can be fed in pieces as it is received; `feed` returns the file
+    entries for the links that were completed by that piece.
+    """
+
+    index: CollectorIndexEntry
+
+    def __init__(self, index: CollectorIndexEntry):
+        self.index = index
+        self._parser = AnchorTagParser()
+        self._consumed = 0
 
-    for link in parser.links:
+    def feed(self, html: str) -> list[CollectorFileEntry]:
+        self._parser.feed(html)
+        return self._new_entries()
+
+    def close(self) -> list[CollectorFileEntry]:
+        self._parser.close()
+        return self._new_entries()
+
+    def _new_entries(self) -> list[CollectorFileEntry]:
+        links = self._parser.links[self._consumed :]
+        self._consumed = len(self._parser.links)
+        return [entry for link in links if (entry := self._file_entry(link))]
+
+    def _file_entry(self, link: str) -> CollectorFileEntry | None:
         # build the full url
-        url = urllib.parse.urljoin(index.url, link)
+        url = urllib.parse.urljoin(self.index.url, link)
         # skip links out of the base directory
-        if not url.startswith(index.url):
+        if not url.startswith(self.index.url):
             LOG.info(
                 "Skipping link %s as it is not in the base directory %s",
                 link,
-                index.url,
+                self.index.url,
             )
-            continue
+            return None
 
         path = urllib.parse.urlparse(url).path
         filename = os.path.basename(path)
 
-        match filename:
-            case f if (
-                f.startswith("bview.") or f.startswith("view.") or f.startswith("rib.")
-            ):
-                file_type = "rib"
-            case f if f.startswith("updates."):
-                file_type = "update"
-            case _:
-                LOG.warning("Unknown file type for %s, skipping", filename)
-                continue
+        file_type = FILE_TYPE_BY_PREFIX.get(filename.partition(".")[0])
+        if file_type is None:
+            LOG.warning("Unknown file type for %s, skipping", filename)
+            return None
 
         if parse_mrt_filename_date(filename) is None:
             LOG.warning("Invalid MRT filename for %s, skipping", filename)
-            continue
-
-        result.append(
-            CollectorFileEntry(
-                index.collector,
-                filename,
-                url,
-                file_type,
-            )
+            return None
+
+        return CollectorFileEntry(
+            self.index.collector,
+            filename,
+            url,
+            file_type,
         )
 
-    return result
+
+def process_index_entry(
+    index: CollectorIndexEntry, html: str | bytes
+) -> list[CollectorFileEntry]:
+    """Extract the relevant files from the collector index entry (str or UTF-8 bytes)."""
+    if isinstance(html, bytes):
+        html = html.decode("utf-8")
+    parser = IndexEntryParser(index)
+    return parser.feed(html) + parser.close()
 
 
 @deprecated("This method will be removed on or after 2025-11-01.")
@@ -0,0 +1,127 @@
+"""Adaptive limit on the number of concurrent downloads."""
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+
+LOG = logging.getLogger(__name__)
+
+
+class AdaptiveConcurrency:
+    """Resizable concurrency window with additive-increase/multiplicative-decrease.
+
+    Completed transfers are grouped into epochs of `window` transfers. At the end
+    of an epoch the aggregate throughput (bytes/second, smoothed with an EWMA) is
+    compared to the previous epoch: if it did not degrade, the window grows by
+    one. Congestion signals (HTTP 429, timeouts) halve the window, at most once
+    per epoch.
+    """
+
+    window: int
+    minimum: int
+    maximum: int
+    in_flight: int
+    throughput: float | None
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: int | None = None,
+        ewma_alpha: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the concurrency window.
+
+        Args:
+            initial: Initial number of concurrent slots
+            minimum: Lower bound for the window (default: 1)
+            maximum: Upper bound for the window (default: initial)
+            ewma_alpha: Weight of the most recent epoch in the throughput average
+            clock: Monotonic clock, injectable for tests
+        """
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum if maximum is not None else initial)
+        self.window = min(self.maximum, max(self.minimum, initial))
+        self.in_flight = 0
+        self.throughput = None
+        self.ewma_alpha = ewma_alpha
+        self.clock = clock
+
+        self._waiters: list[asyncio.Future[None]] = []
+        self._start_epoch()
+
+    def _start_epoch(self) -> None:
+        self._epoch_start = self.clock()
+        self._epoch_bytes = 0
+        self._epoch_transfers = 0
+        self._decreased_in_epoch = False
+
+    def _resize(self, window: int) -> None:
+        window = min(self.maximum, max(self.minimum, window))
+        if window != self.window:
+            LOG.debug("Adjusting download concurrency %d -> %d", self.window, window)
+            self.window = window
+            self._wake()
+
+    def _wake(self) -> None:
+        # Waiters re-check the window when woken, so waking all of them is safe.
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._waiters.clear()
+
+    async def acquire(self) -> None:
+        while self.in_flight >= self.window:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            await waiter
+        self.in_flight += 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one of the concurrent slots for the duration of the block."""
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def record_transfer(self, num_bytes: int) -> None:
+        """Record a completed transfer, growing the window at the end of an epoch."""
+        self._epoch_bytes += num_bytes
+        self._epoch_transfers += 1
+        if self._epoch_transfers < self.window:
+            return
+
+        elapsed = self.clock() - self._epoch_start
+        if elapsed > 0:
+            epoch_throughput = self._epoch_bytes / elapsed
+            previous = self.throughput
+            if previous is None:
+                self.throughput = epoch_throughput
+            else:
+                self.throughput = (
+                    self.ewma_alpha * epoch_throughput
+                    + (1 - self.ewma_alpha) * previous
+                )
+
+            if previous is None or self.throughput >= previous:
+                self._resize(self.window + 1)
+
+        self._start_epoch()
+
+    def record_congestion(self) -> None:
+        """Record a congestion signal from the server, halving the window."""
+        if self._decreased_in_epoch:
+            return
+
+        self._resize(self.window // 2)
+        self._start_epoch()
+        self._decreased_in_epoch = True
@@ -1,12 +1,12 @@
 import asyncio
 import datetime
+import functools
 import itertools
 import logging
-from collections.abc import Iterable
+from collections.abc import AsyncIterator, Iterable
 from pathlib import Path
 from typing import Literal
 
-import aiohttp
 import click
 
 from mrt_downloader.cache import (
@@ -16,13 +16,22 @@ from mrt_downloader.cache import (
     store_collectors,
 )
 from mrt_downloader.collector_index import (
+    FILE_TYPES_BOTH,
+    FILE_TYPES_RIB,
+    FILE_TYPES_UPDATE,
     index_files_for_collector,
 )
 from mrt_downloader.collectors import get_ripe_ris_collectors, get_routeviews_collectors
-from mrt_downloader.http import DownloadWorker, FileNamingStrategy, IndexWorker
+from mrt_downloader.concurrency import AdaptiveConcurrency
+from mrt_downloader.http import (
+    DEFAULT_MAX_CONNECTIONS_PER_HOST,
+    DownloadWorker,
+    FileNamingStrategy,
+    IndexWorker,
+    build_session,
+)
 from mrt_downloader.models import (
     CollectorFileEntry,
-    CollectorIndexEntry,
     CollectorInfo,
 )
 
@@ -56,7 +65,7 @@ def select_files_for_download(
     return selected_files
 
 
-async def download_files(
+async def download_files_stream(
     target_dir: Path,
     start_time: datetime.datetime,
     end_time: datetime.datetime,
@@ -67,8 +76,16 @@ async def download_files(
     collectors: list[str] | None = None,
     project: frozenset[Literal["ris", "routeviews"]] = frozenset(["ris"]),
     force_cache_refresh: bool = False,
-):
-    """Gather the list of update files per timestamp per rrc and download them."""
+    max_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+    assume_immutable_after: datetime.timedelta | None = None,
+) -> AsyncIterator[Path]:
+    """
+    Gather the list of update files per timestamp per rrc and download them.
+
+    Yields the path of each file as soon as it is downloaded (or found to be up
+    to date), while the remaining indexes and files are still being processed.
+    Files that fail to download are logged and not yielded.
+    """
     assert start_time.tzinfo == datetime.UTC, "Start time must be in UTC"
     assert end_time.tzinfo == datetime.UTC, "End time must be in UTC"
     assert start_time < end_time, "Start time must be before end time"
@@ -81,8 +98,12 @@ async def download_files(
     except Exception as e:
         LOG.warning("Index cache is unavailable at %s: %s", db_path, e)
 
-    file_types = frozenset(
-        ["rib"] if rib_only else ["update"] if update_only else ["rib", "update"]
+    file_types = (
+        FILE_TYPES_RIB
+        if rib_only
+        else FILE_TYPES_UPDATE
+        if update_only
+        else FILE_TYPES_BOTH
     )
 
     if collectors is not None and len(collectors) > 0:
@@ -94,7 +115,8 @@ async def download_files(
         )
 
     # Get the collectors (from cache or API)
-    async with aiohttp.ClientSession() as session:
+    # One session (and connection pool) is shared by the index and download workers
+    async with build_session(max_per_host=max_per_host) as session:
         collector_infos_list: list[list[CollectorInfo]] = []
 
         for proj in project:
@@ -143,44 +165,105 @@ async def download_files(
             )
         )
 
-        index_queue: asyncio.Queue[CollectorIndexEntry] = asyncio.Queue()
-        for idx in indices:
-            index_queue.put_nowait(idx)
+        queue: asyncio.Queue[CollectorFileEntry] = asyncio.Queue()
+        # paths of the finished files, None once all files are processed
+        done_queue: asyncio.Queue[Path | None] = asyncio.Queue()
+        # The window starts at half of num_workers and grows up to it while the
+        # throughput improves, it shrinks when the servers push back.
+        concurrency = AdaptiveConcurrency(
+            initial=max(1, num_workers // 2), maximum=num_workers
+        )
+        download_worker = DownloadWorker(
+            target_dir,
+            naming_strategy,
+            session,
+            queue,
+            concurrency=concurrency,
+            assume_immutable_after=assume_immutable_after,
+            out_queue=done_queue,
+        )
+        # Downloads start as soon as the first index is processed.
+        download_tasks = [
+            asyncio.create_task(download_worker.run()) for _ in range(num_workers)
+        ]
 
         index_worker = IndexWorker(
             session,
-            index_queue,
+            indices,
             file_types=file_types,
             db_path=db_path,
             force_cache_refresh=force_cache_refresh,
+            out_queue=queue,
+            select=functools.partial(
+                select_files_for_download,
+                start_time=start_time,
+                end_time=end_time,
+                file_types=file_types,
+            ),
         )
-        # run num_workers workers to get the indices.
-        status = await asyncio.gather(*[index_worker.run() for _ in range(num_workers)])
 
-        LOG.info(
-            "Processed %d directory indexes for %d collectors",
-            sum(status),
-            len(collector_infos),
-        )
+        async def process() -> None:
+            try:
+                processed_indexes = await index_worker.run()
 
-        queue: asyncio.Queue[CollectorFileEntry] = asyncio.Queue()
-        download_worker = DownloadWorker(target_dir, naming_strategy, session, queue)
+                LOG.info(
+                    "Processed %d directory indexes for %d collectors",
+                    processed_indexes,
+                    len(collector_infos),
+                )
 
-        # Add the relevant files to queue
-        selected_files = select_files_for_download(
-            index_worker.results, start_time, end_time, file_types
-        )
-        for file in selected_files:
-            queue.put_nowait(file)
+                # All files are queued, wait for the download workers to finish them.
+                await queue.join()
+            finally:
+                done_queue.put_nowait(None)
+
+        process_task = asyncio.create_task(process())
+        try:
+            while (path := await done_queue.get()) is not None:
+                yield path
+            # raises if processing the indexes failed
+            await process_task
+        finally:
+            # also stops the downloads when the caller stops iterating early
+            process_task.cancel()
+            for task in download_tasks:
+                task.cancel()
+            await asyncio.gather(process_task, *download_tasks, return_exceptions=True)
 
         LOG.info(
             "Selected %d files for download out of %d",
-            len(selected_files),
+            download_worker.processed,
             len(index_worker.results),
         )
 
-        # Now run the download workers.
-        download_status = await asyncio.gather(
-            *[download_worker.run() for _ in range(num_workers)]
-        )
-        LOG.info("Downloaded %d files", sum(download_status))
+
+async def download_files(
+    target_dir: Path,
+    start_time: datetime.datetime,
+    end_time: datetime.datetime,
+    num_workers: int,
+    naming_strategy: FileNamingStrategy,
+    rib_only: bool = False,
+    update_only: bool = False,
+    collectors: list[str] | None = None,
+    project: frozenset[Literal["ris", "routeviews"]] = frozenset(["ris"]),
+    force_cache_refresh: bool = False,
+    max_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+    assume_immutable_after: datetime.timedelta | None = None,
+):
+    """Gather the list of update files per timestamp per rrc and download them."""
+    async for _ in download_files_stream(
+        target_dir,
+        start_time,
+        end_time,
+        num_workers,
+        naming_strategy,
+        rib_only=rib_only,
+        update_only=update_only,
+        collectors=collectors,
+        project=project,
+        force_cache_refresh=force_cache_refresh,
+        max_per_host=max_per_host,
+        assume_immutable_after=assume_immutable_after,
+    ):
+        pass
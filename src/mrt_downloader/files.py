@@ -1,5 +1,6 @@
 import logging
 import pathlib
+import re
 from collections.abc import Sequence
 from dataclasses import dataclass
 
@@ -33,6 +34,11 @@ def parse_standard_filename(filename: str) -> ParsedFilenameSegments:
     return ParsedFilenameSegments(year, month, day, hour, minute)
 
 
+# The collector name runs up to the first dash after "route-" (and at least one
+# character past it), e.g. route-views.chicago or route-views8.
+ROUTE_VIEWS_PREFIX_PATTERN = re.compile(r"(.*?route-.[^-]*)-(.*)", re.DOTALL)
+
+
 def split_on_dash_except_route_views(inp: str) -> tuple[str, str]:
     """
     Split a string on dash, where the dash is not after the word route.
@@ -40,13 +46,14 @@ def split_on_dash_except_route_views(inp: str) -> tuple[str, str]:
     Ensures that cases like route-views.chicago-updates.20250714.2345.bz2 are split correctly.
     """
     if "route-" in inp:
-        idx = inp.index("route-") + len("route-")
-        split_idx = inp.index("-", idx + 1)
-        return inp[:split_idx], inp[split_idx + 1 :]
-    else:
-        tokens = inp.split("-", 1)
-        assert len(tokens) == 2
-        return tokens[0], tokens[1]
+        match = ROUTE_VIEWS_PREFIX_PATTERN.match(inp)
+        if match is None:
+            raise ValueError(f"No dash after collector name in {inp!r}")
+        return match.group(1), match.group(2)
+
+    head, sep, tail = inp.partition("-")
+    assert sep
+    return head, tail
 
 
 class ByCollectorPartitionedStategy(FileNamingStrategy):
@@ -1,15 +1,21 @@
 import asyncio
+import codecs
+import contextlib
 import email.utils
+import functools
+import io
 import logging
 import os
 import random
 import tempfile
 import time
 from abc import ABC, abstractmethod
-from datetime import UTC, datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
 from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
-from typing import Awaitable, Callable, Iterable, Literal, Sequence, TypeVar
+from typing import IO, Awaitable, Callable, Iterable, Literal, Sequence, TypeVar
 
 import aiohttp
 import click
@@ -20,11 +26,10 @@ from mrt_downloader.cache import (
     get_month_end_date,
     store_index,
 )
-from mrt_downloader.collector_index import (
-    process_index_entry,
-)
+from mrt_downloader.collector_index import FILE_TYPES_BOTH, IndexEntryParser
+from mrt_downloader.concurrency import AdaptiveConcurrency
 from mrt_downloader.mirrors import file_url_alternatives
-from mrt_downloader.models import CollectorFileEntry, CollectorIndexEntry, Download
+from mrt_downloader.models import CollectorFileEntry, CollectorIndexEntry
 
 LOG = logging.getLogger(__name__)
 
@@ -36,8 +41,29 @@ except PackageNotFoundError:
 USER_AGENT = f"mrt-downloader/{__version__} https://github.com/ties/mrt-downloader"
 DEFAULT_RETRY_CLIENT_STATUSES = frozenset((429,))
 MIRRORED_FILE_RETRY_CLIENT_STATUSES = frozenset((404,))
+# Connection pool limits, collector hosts serve many parallel downloads well.
+MAX_CONNECTIONS = 512
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 32
+DNS_CACHE_TTL_SECONDS = 60 * 60
+# Response data is buffered up to this size before it is written to disk.
+WRITE_BUFFER_SIZE = 4 * 1024 * 1024
+# Threads writing response data to disk, shared by all downloads.
+DISK_WRITE_THREADS = 8
+# Size of the aiohttp read buffer per response, fewer wake-ups on fast links.
+READ_BUFFER_SIZE = 1024 * 1024
+# Files verified against the server are not re-checked within this period.
+FRESHNESS_CACHE_TTL_SECONDS = 60 * 60
+FRESHNESS_CACHE_MAX_ENTRIES = 65536
+# Number of directory indexes downloaded concurrently.
+INDEX_CONCURRENCY = 16
+# Extended attributes holding the validators of a downloaded file, for conditional GETs.
+ETAG_XATTR = "user.mrt_downloader.etag"
+LAST_MODIFIED_XATTR = "user.mrt_downloader.last-modified"
+
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
 
 T = TypeVar("T")
+FileEntrySelector = Callable[[list[CollectorFileEntry]], list[CollectorFileEntry]]
 
 
 def _parse_retry_after(value: str | None) -> float | None:
@@ -66,14 +92,17 @@ def retry_client_statuses_for_urls(urls: Sequence[str]) -> frozenset[int]:
 
 
 class RetryHelper:
-    """Helper class for retrying HTTP operations with exponential backoff.
+    """Helper class for retrying HTTP operations with decorrelated jitter backoff.
 
-    Implements retry logic with exponential backoff for network operations:
+    Implements retry logic with randomized backoff for network operations:
     - Initial delay: 2 seconds
-    - Backoff multiplier: 2x (2s, 4s, 8s, 16s)
-    - Additive jitter: random delay from zero to the base delay
+    - Each delay is drawn uniformly from [initial delay, 3x the previous delay]
+    - Maximum delay: 60 seconds (longer when a 429 carries a later Retry-After)
     - Default max retries: 4
 
+    The randomized delays keep clients that failed at the same moment (e.g. during
+    a brief outage) from retrying in lockstep.
+
     Retries on network errors (timeouts, connection errors, DNS failures).
     Retries on HTTP 429 by default. Does not retry on other HTTP 4xx errors
     (client errors), unless a caller marks a specific client status as retryable.
@@ -83,35 +112,44 @@ class RetryHelper:
         self,
         max_retries: int = 4,
         initial_delay: float = 2.0,
+        max_delay: float = 60.0,
         random_start: Callable[[int], int] | None = None,
-        random_jitter: Callable[[float], float] | None = None,
+        random_uniform: Callable[[float, float], float] | None = None,
         sleep: Callable[[float], Awaitable[None]] | None = None,
+        on_retry: Callable[[BaseException], None] | None = None,
     ):
         """Initialize the retry helper.
 
         Args:
             max_retries: Maximum number of retry attempts (default: 4)
             initial_delay: Initial delay in seconds before first retry (default: 2.0)
+            max_delay: Upper bound for the backoff delay in seconds (default: 60.0)
             random_start: Optional random starting index provider for mirror rotation
-            random_jitter: Optional jitter provider for retry delay tests
+            random_uniform: Optional uniform random provider for retry delay tests
             sleep: Optional async sleep function for retry delay tests
+            on_retry: Optional callback invoked with the error before each retry
         """
         self.max_retries = max_retries
         self.initial_delay = initial_delay
+        self.max_delay = max_delay
         self.random_start = random_start or random.randrange
-        self.random_jitter = random_jitter or (lambda delay: random.uniform(0, delay))
+        self.random_uniform = random_uniform or random.uniform
         self.sleep = sleep or asyncio.sleep
+        self.on_retry = on_retry
 
-    def _retry_delay(self, attempt: int, error: BaseException) -> float:
-        base_delay = self.initial_delay * (2**attempt)
+    def _retry_delay(self, previous_delay: float, error: BaseException) -> float:
+        delay = min(
+            self.max_delay,
+            self.random_uniform(self.initial_delay, previous_delay * 3),
+        )
         if isinstance(error, aiohttp.ClientResponseError) and error.status == 429:
             retry_after = _parse_retry_after(
                 error.headers.get("Retry-After") if error.headers else None
             )
             if retry_after is not None:
-                base_delay = max(base_delay, retry_after)
+                delay = max(delay, retry_after)
 
-        return base_delay + self.random_jitter(base_delay)
+        return delay
 
     async def execute(
         self,
@@ -157,6 +195,7 @@ class RetryHelper:
             self.random_start(len(urls)) if randomize_start and len(urls) > 1 else 0
         )
         last_exception = None
+        delay = self.initial_delay
         retryable_client_statuses = (
             DEFAULT_RETRY_CLIENT_STATUSES | retry_client_statuses
         )
@@ -175,7 +214,9 @@ class RetryHelper:
 
                 # Calculate backoff delay
                 if attempt < self.max_retries:
-                    delay = self._retry_delay(attempt, e)
+                    if self.on_retry is not None:
+                        self.on_retry(e)
+                    delay = self._retry_delay(delay, e)
                     target = f" via {attempt_url}" if attempt_url else ""
                     message = (
                         f"{operation_name}{target} failed (attempt {attempt + 1}/{self.max_retries + 1}): {e}. "
@@ -213,6 +254,37 @@ class RetryHelper:
         raise last_exception
 
 
+@functools.lru_cache(maxsize=4096)
+def _parse_http_date(value: str) -> datetime | None:
+    # Many responses share a Last-Modified value, parse each distinct one once.
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+    except ValueError as e:
+        LOG.info(f"Failed to parse Last-Modified header: {e}")
+        return None
+    # The asctime form and a -0000 zone parse as naive datetimes, HTTP dates are UTC
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed
+
+
+def incremental_decoder(charset: str | None) -> Callable[[], codecs.IncrementalDecoder]:
+    """Incremental decoder factory for a response charset, utf-8 if it is unknown.
+
+    Like aiohttp's ClientResponse.get_encoding, an unknown charset falls back
+    instead of failing the response.
+    """
+    if charset:
+        with contextlib.suppress(LookupError, ValueError):
+            return codecs.lookup(charset).incrementaldecoder
+    return codecs.getincrementaldecoder("utf-8")
+
+
+def timestamp_ns(value: datetime) -> int:
+    """POSIX timestamp of an aware datetime in integer nanoseconds, without float rounding."""
+    return (value - EPOCH) // timedelta(microseconds=1) * 1000
+
+
 def parse_last_modified(response: aiohttp.ClientResponse) -> datetime | None:
     """
     Parse the 'Last-Modified' header from the response and return it as a datetime object.
@@ -223,83 +295,158 @@ def parse_last_modified(response: aiohttp.ClientResponse) -> datetime | None:
     """
     last_modified = response.headers.get("Last-Modified", None)
     if last_modified:
-        try:
-            return email.utils.parsedate_to_datetime(last_modified)
-        except ValueError as e:
-            LOG.info(f"Failed to parse Last-Modified header: {e}")
+        return _parse_http_date(last_modified)
     return None
 
 
-def build_session() -> aiohttp.ClientSession:
+def read_xattr(target_file: Path, name: str) -> str | None:
     """
-    Build an aiohttp client session with default settings and user-agent.
+    Read a string stored in an extended attribute of a downloaded file.
+
+    Returns None when it was not stored or the platform/filesystem lacks xattrs.
     """
-    # aiohttp TCPConnector users happy eyeballs by default
-    #
-    # We use a low total timeout (downloads can take minutes), but relatively quick connect timeout.
-    return aiohttp.ClientSession(
-        timeout=ClientTimeout(total=15 * 60, sock_connect=30),
-        headers={"User-Agent": USER_AGENT},
+    if not hasattr(os, "getxattr"):
+        return None
+    try:
+        return os.getxattr(target_file, name).decode("ascii")
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def store_xattr(target_file: Path, name: str, value: str | None) -> None:
+    """Store a string in an extended attribute of a downloaded file, if possible."""
+    if not value or not hasattr(os, "setxattr"):
+        return
+    try:
+        os.setxattr(target_file, name, value.encode("ascii"))
+    except (OSError, UnicodeEncodeError) as e:
+        LOG.debug("Could not store %s for %s: %s", name, target_file, e)
+
+
+def read_etag(target_file: Path) -> str | None:
+    return read_xattr(target_file, ETAG_XATTR)
+
+
+def store_validators(target_file: Path, response: aiohttp.ClientResponse) -> None:
+    """Store the ETag and Last-Modified of the response with the downloaded file."""
+    store_xattr(target_file, ETAG_XATTR, response.headers.get("ETag"))
+    store_xattr(target_file, LAST_MODIFIED_XATTR, response.headers.get("Last-Modified"))
+
+
+def conditional_headers(target_file: Path, stat: os.stat_result) -> dict[str, str]:
+    """
+    Build the headers for a conditional GET of an already downloaded file.
+
+    Uses the validators stored with the file. Without a stored Last-Modified the
+    mtime is used, which is set to the Last-Modified of the response on download.
+    """
+    last_modified = read_xattr(target_file, LAST_MODIFIED_XATTR)
+    headers = {
+        "If-Modified-Since": last_modified
+        or email.utils.formatdate(stat.st_mtime, usegmt=True),
+    }
+    etag = read_etag(target_file)
+    if etag:
+        headers["If-None-Match"] = etag
+    return headers
+
+
+@functools.cache
+def disk_executor() -> ThreadPoolExecutor:
+    """
+    Thread pool for disk writes, shared by all downloads.
+
+    Bounded separately from the default executor, so the number of concurrent
+    writes does not grow with the number of downloads.
+    """
+    return ThreadPoolExecutor(
+        max_workers=DISK_WRITE_THREADS, thread_name_prefix="mrt-downloader-write"
     )
 
 
-async def download_file(session: aiohttp.ClientSession, download: Download) -> None:
-    t0 = time.time()
-    if download.target_file.is_file():
-        # check if file is modified
-        async with session.head(download.url) as response:
-            content_length = response.headers.get("Content-Length", None)
-            last_modified = parse_last_modified(response)
-            if content_length and last_modified:
-                # Stat the current file
-                stat = download.target_file.stat()
-                if (
-                    stat.st_size == int(content_length)
-                    and stat.st_mtime == last_modified.timestamp()
-                ):
-                    LOG.debug(
-                        "Skipping %s, already downloaded",
-                        download.target_file,
-                    )
-                    return
-
-    async with session.get(download.url) as response:
-        LOG.debug("HTTP %d %.3fs", response.status, time.time() - t0)
-        if response.status == 200:
-            with download.target_file.open("wb") as f:
-                async for data in response.content.iter_chunked(131072):
-                    f.write(data)
-            # Get last modified time from the response
-            last_modified = parse_last_modified(response)
-            if last_modified:
-                os.utime(
-                    download.target_file,
-                    (last_modified.timestamp(), last_modified.timestamp()),
-                )
+def drop_page_cache(f: IO[bytes]) -> None:
+    """
+    Write a downloaded file back to disk and drop its pages from the page cache.
 
-            LOG.debug(
-                "Downloaded %s to %s in %.3fs",
-                download.url,
-                download.target_file,
-                time.time() - t0,
-            )
-        else:
-            raise ValueError(f"Got status {response.status} for {download.url}")
+    Downloaded files are not read again, so their pages should not evict data that
+    is. POSIX_FADV_DONTNEED only drops clean pages: the data is synced first, which
+    also makes the file durable before it is renamed into place. This blocks on the
+    disk, run it on the disk executor. Without posix_fadvise the file is only synced.
+    """
+    f.flush()
+    try:
+        fd = f.fileno()
+        # fdatasync skips the metadata-only flush, it is missing on macOS
+        getattr(os, "fdatasync", os.fsync)(fd)
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except (OSError, io.UnsupportedOperation) as e:
+        LOG.debug("Dropping the page cache failed for %s: %s", f, e)
 
 
-async def worker(session: aiohttp.ClientSession, queue: asyncio.Queue[Download]) -> int:
-    processed = 0
-    while not queue.empty():
-        download = await queue.get()
-        processed += 1
-        try:
-            await download_file(session, download)
-        except Exception as e:
-            LOG.error(e)
-        finally:
-            queue.task_done()
+async def write_response_body(response: aiohttp.ClientResponse, f: IO[bytes]) -> int:
+    """
+    Write the response body to f, returning the number of bytes written.
 
-    return processed
+    readany() returns whatever the stream has buffered without re-chunking it, the
+    chunks are written in batches of WRITE_BUFFER_SIZE. writelines() passes the
+    buffers received from aiohttp to the file as-is: chunks are never copied or
+    joined. Writes run on the disk executor, so a slow disk does not block the
+    other downloads on the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    written = 0
+    buffered = 0
+    chunks: list[bytes] = []
+    while data := await response.content.readany():
+        chunks.append(data)
+        buffered += len(data)
+        if buffered >= WRITE_BUFFER_SIZE:
+            await loop.run_in_executor(disk_executor(), f.writelines, chunks)
+            written += buffered
+            chunks = []
+            buffered = 0
+
+    if chunks:
+        await loop.run_in_executor(disk_executor(), f.writelines, chunks)
+    return written + buffered
+
+
+def build_session(
+    max_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST, force_close: bool = False
+) -> aiohttp.ClientSession:
+    """
+    Build an aiohttp client session with a tuned connection pool and user-agent.
+
+    Downloads concentrate on a few collector hosts, so the pool allows many
+    connections per host and keeps them alive between files. All workers should
+    share the one session (and connection pool) built here.
+
+    Args:
+        max_per_host: Maximum number of connections per host (default: 32)
+        force_close: Close connections after each request instead of reusing them
+    """
+    # aiohttp TCPConnector users happy eyeballs by default
+    #
+    # Concurrent lookups for the same host share one resolution, and the few
+    # collector hosts are cached for the whole run. aiohttp uses the aiodns based
+    # AsyncResolver when aiodns is installed.
+    connector = aiohttp.TCPConnector(
+        limit=MAX_CONNECTIONS,
+        limit_per_host=max_per_host,
+        ttl_dns_cache=DNS_CACHE_TTL_SECONDS,
+        force_close=force_close,
+        # keep-alive can not be combined with force_close
+        keepalive_timeout=None if force_close else 75,
+    )
+    # We use a low total timeout (downloads can take minutes), but relatively quick connect timeout.
+    return aiohttp.ClientSession(
+        connector=connector,
+        connector_owner=True,
+        timeout=ClientTimeout(total=15 * 60, sock_connect=30),
+        headers={"User-Agent": USER_AGENT},
+        read_bufsize=READ_BUFFER_SIZE,
+    )
 
 
 class FileNamingStrategy(ABC):
@@ -318,7 +465,17 @@ class DownloadWorker:
     queue: asyncio.Queue[CollectorFileEntry]
     naming_strategy: FileNamingStrategy
     check_modified: bool
+    concurrency: AdaptiveConcurrency | None
+    assume_immutable_after: timedelta | None
+    out_queue: asyncio.Queue[Path | None] | None
     retry_helper: RetryHelper
+    processed: int
+    # url -> (st_size, st_mtime_ns, verified at) for files known to be up to date
+    _freshness_cache: OrderedDict[str, tuple[int, int, float]]
+    # target directories that were created (or found to exist) by this worker
+    _created_dirs: set[Path]
+    # url -> future resolved with the success of the download in progress
+    _inflight: dict[str, asyncio.Future[bool]]
 
     def __init__(
         self,
@@ -327,171 +484,294 @@ class DownloadWorker:
         session: aiohttp.ClientSession,
         queue: asyncio.Queue[CollectorFileEntry],
         check_modified: bool = True,
+        concurrency: AdaptiveConcurrency | None = None,
+        assume_immutable_after: timedelta | None = None,
+        out_queue: asyncio.Queue[Path | None] | None = None,
     ):
+        """Initialize the download worker.
+
+        Args:
+            base_dir: Directory the files are downloaded to
+            naming_strategy: Strategy for the path of a file in base_dir
+            session: HTTP session used for the downloads
+            queue: Queue of the entries to download
+            check_modified: Check whether existing files changed on the server
+            concurrency: Optional adaptive limit on the concurrent downloads
+            assume_immutable_after: Existing files with a filename date older
+                than this are not checked with the server
+            out_queue: Optional queue that the path of each file is put on once
+                it is downloaded (or found to be up to date); the owner of the
+                queue may put None on it to mark the end
+        """
         self.base_dir = base_dir
         self.session = session
         self.queue = queue
         self.naming_strategy = naming_strategy
         self.check_modified = check_modified
-        self.retry_helper = RetryHelper()
+        self.concurrency = concurrency
+        self.assume_immutable_after = assume_immutable_after
+        self.out_queue = out_queue
+        self.retry_helper = RetryHelper(on_retry=self._on_retry)
+        self.processed = 0
+        self._freshness_cache = OrderedDict()
+        self._created_dirs = set()
+        self._inflight = {}
+
+    def _is_immutable(self, entry: CollectorFileEntry) -> bool:
+        if self.assume_immutable_after is None:
+            return False
+
+        try:
+            file_date = entry.date
+        except ValueError:
+            return False
+
+        return file_date < datetime.now(UTC) - self.assume_immutable_after
+
+    def _is_recently_verified(self, url: str, stat: os.stat_result) -> bool:
+        cached = self._freshness_cache.get(url)
+        if cached is None:
+            return False
+
+        size, mtime_ns, verified_at = cached
+        if time.monotonic() - verified_at >= FRESHNESS_CACHE_TTL_SECONDS:
+            del self._freshness_cache[url]
+            return False
+
+        return stat.st_size == size and stat.st_mtime_ns == mtime_ns
+
+    def _mark_verified(self, url: str, target_file: Path) -> None:
+        stat = target_file.stat()
+        self._freshness_cache[url] = (stat.st_size, stat.st_mtime_ns, time.monotonic())
+        self._freshness_cache.move_to_end(url)
+        if len(self._freshness_cache) > FRESHNESS_CACHE_MAX_ENTRIES:
+            self._freshness_cache.popitem(last=False)
+
+    def _on_retry(self, error: BaseException) -> None:
+        if self.concurrency is None:
+            return
+
+        if isinstance(error, asyncio.TimeoutError) or (
+            isinstance(error, aiohttp.ClientResponseError) and error.status == 429
+        ):
+            self.concurrency.record_congestion()
+
+    async def _do_get(
+        self, target_file: Path, t0: float, headers: dict[str, str], url: str
+    ) -> int | None:
+        """Download url to target_file, returning None if it was not modified."""
+        async with self.session.get(url, headers=headers) as response:
+            LOG.debug("HTTP %d %.3fs", response.status, time.time() - t0)
+            if response.status == 304:
+                return None
+            if response.status != 200:
+                raise aiohttp.ClientResponseError(
+                    request_info=response.request_info,
+                    history=response.history,
+                    status=response.status,
+                    message=f"HTTP {response.status}",
+                    headers=response.headers,
+                )
+
+            # Download to temporary file first
+            tmp_file: Path | None = None
+            try:
+                with tempfile.NamedTemporaryFile(
+                    dir=target_file.parent, suffix=".tmp", delete=False
+                ) as f:
+                    tmp_file = Path(f.name)
+                    written = await write_response_body(response, f)
+                    await asyncio.get_running_loop().run_in_executor(
+                        disk_executor(), drop_page_cache, f
+                    )
+
+                tmp_file.replace(target_file)
+                tmp_file = None
+            finally:
+                if tmp_file is not None:
+                    tmp_file.unlink(missing_ok=True)
+
+            # Get last modified time from the response
+            last_modified = parse_last_modified(response)
+            if last_modified:
+                mtime_ns = timestamp_ns(last_modified)
+                os.utime(target_file, ns=(mtime_ns, mtime_ns))
+            store_validators(target_file, response)
 
-    async def download_file(self, entry: CollectorFileEntry) -> None:
+            LOG.debug(
+                "Downloaded %s to %s in %.3fs",
+                url,
+                target_file,
+                time.time() - t0,
+            )
+            return written
+
+    async def download_file(self, entry: CollectorFileEntry) -> int:
+        """
+        Download the file for entry, returning the number of bytes written.
+
+        Concurrent calls for the same url share one request: the later calls wait
+        for the first one and return 0, or try again if it failed.
+        """
+        while (inflight := self._inflight.get(entry.url)) is not None:
+            # shield: cancelling a waiter must not cancel the shared future
+            if await asyncio.shield(inflight):
+                LOG.debug("Skipping %s, downloaded concurrently", entry.url)
+                return 0
+
+        done = asyncio.get_running_loop().create_future()
+        self._inflight[entry.url] = done
+        succeeded = False
+        try:
+            written = await self._download_file(entry)
+            succeeded = True
+            return written
+        finally:
+            del self._inflight[entry.url]
+            done.set_result(succeeded)
+
+    async def _download_file(self, entry: CollectorFileEntry) -> int:
         target_file = self.naming_strategy.get_path(self.base_dir, entry)
 
-        # Create target directory if it does not exist
-        target_file.parent.mkdir(parents=True, exist_ok=True)
+        # Create target directory if it does not exist (once per directory)
+        if target_file.parent not in self._created_dirs:
+            target_file.parent.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(target_file.parent)
+
+        urls = file_url_alternatives(entry)
+        retry_client_statuses = retry_client_statuses_for_urls(urls)
 
         t0 = time.time()
+        headers: dict[str, str] = {}
         if target_file.is_file():
             if not self.check_modified:
                 LOG.debug(
                     "Skipping %s w/o modification check, already downloaded",
                     target_file,
                 )
-                return
-
-            # check if file is modified with retry logic
-            urls = file_url_alternatives(entry)
-
-            async def check_modified(url: str):
-                async with self.session.head(url, allow_redirects=True) as response:
-                    if response.status != 200:
-                        raise aiohttp.ClientResponseError(
-                            request_info=response.request_info,
-                            history=response.history,
-                            status=response.status,
-                            message=f"HTTP {response.status}",
-                            headers=response.headers,
-                        )
-                    return response.headers.get(
-                        "Content-Length", None
-                    ), parse_last_modified(response)
-
-            content_length, last_modified = await self.retry_helper.execute_with_urls(
-                check_modified,
-                f"HEAD {entry.url}",
-                urls,
-                retry_client_statuses=retry_client_statuses_for_urls(urls),
-                randomize_start=False,
-            )
+                return 0
 
-            if content_length and last_modified:
-                # Stat the current file
-                stat = target_file.stat()
-                if (
-                    stat.st_size == int(content_length)
-                    and stat.st_mtime == last_modified.timestamp()
-                ):
-                    LOG.debug(
-                        "Skipping %s (%db at %s), already downloaded",
-                        target_file,
-                        stat.st_size,
-                        last_modified,
-                    )
-                    return
+            if self._is_immutable(entry):
+                LOG.debug(
+                    "Skipping %s, historical file already downloaded", target_file
+                )
+                return 0
 
-        # Download file with retry logic
-        urls = file_url_alternatives(entry)
+            stat = target_file.stat()
+            if self._is_recently_verified(entry.url, stat):
+                LOG.debug("Skipping %s, recently verified", target_file)
+                return 0
 
-        async def download(url: str):
-            async with self.session.get(url) as response:
-                LOG.debug("HTTP %d %.3fs", response.status, time.time() - t0)
-                if response.status == 200:
-                    # Download to temporary file first
-                    tmp_file: Path | None = None
-                    try:
-                        with tempfile.NamedTemporaryFile(
-                            dir=target_file.parent, suffix=".tmp", delete=False
-                        ) as f:
-                            tmp_file = Path(f.name)
-                            async for data in response.content.iter_chunked(131072):
-                                f.write(data)
-                            f.flush()
-
-                        tmp_file.replace(target_file)
-                        tmp_file = None
-                    finally:
-                        if tmp_file is not None:
-                            tmp_file.unlink(missing_ok=True)
-
-                    # Get last modified time from the response
-                    last_modified = parse_last_modified(response)
-                    if last_modified:
-                        os.utime(
-                            target_file,
-                            (
-                                last_modified.timestamp(),
-                                last_modified.timestamp(),
-                            ),
-                        )
-
-                    LOG.debug(
-                        "Downloaded %s to %s in %.3fs",
-                        url,
-                        target_file,
-                        time.time() - t0,
-                    )
-                else:
-                    raise aiohttp.ClientResponseError(
-                        request_info=response.request_info,
-                        history=response.history,
-                        status=response.status,
-                        message=f"HTTP {response.status}",
-                        headers=response.headers,
-                    )
+            # the server answers 304 if the local copy is still current
+            headers = conditional_headers(target_file, stat)
 
-        await self.retry_helper.execute_with_urls(
-            download,
+        # Download file with retry logic
+        written = await self.retry_helper.execute_with_urls(
+            functools.partial(self._do_get, target_file, t0, headers),
             f"Download {entry.url}",
             urls,
-            retry_client_statuses=retry_client_statuses_for_urls(urls),
+            retry_client_statuses=retry_client_statuses,
             randomize_start=False,
         )
+        if written is None:
+            LOG.debug("Skipping %s, not modified", target_file)
+            written = 0
 
-    async def run(self) -> int:
-        processed = 0
-        while not self.queue.empty():
-            download = await self.queue.get()
-            processed += 1
+        self._mark_verified(entry.url, target_file)
+        return written
+
+    async def run(self) -> None:
+        """
+        Download queued entries until cancelled.
+
+        Several tasks can run the same worker. The caller waits for queue.join() and
+        then cancels them; the number of processed entries is kept in `processed`.
+        """
+        while True:
+            # Only suspend when the queue is empty, most entries are queued in bulk
+            try:
+                download = self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                download = await self.queue.get()
             try:
-                await self.download_file(download)
+                self.processed += 1
+                if self.concurrency is None:
+                    await self.download_file(download)
+                else:
+                    async with self.concurrency.slot():
+                        written = await self.download_file(download)
+                    if written:
+                        self.concurrency.record_transfer(written)
+                if self.out_queue is not None:
+                    self.out_queue.put_nowait(
+                        self.naming_strategy.get_path(self.base_dir, download)
+                    )
             except Exception as e:
                 LOG.error(e)
             finally:
                 self.queue.task_done()
-        return processed
 
 
 class IndexWorker:
     session: aiohttp.ClientSession
-    queue: asyncio.Queue[CollectorIndexEntry]
+    entries: list[CollectorIndexEntry]
     results: list[CollectorFileEntry] = []
     file_types: frozenset[Literal["rib", "update"]]
     db_path: Path | None
     force_cache_refresh: bool
     retry_helper: RetryHelper
+    out_queue: asyncio.Queue[CollectorFileEntry] | None
+    select: FileEntrySelector | None
+    concurrency: int
 
     def __init__(
         self,
         session: aiohttp.ClientSession,
-        queue: asyncio.Queue[CollectorIndexEntry],
-        file_types: Iterable[Literal["rib", "update"]] = frozenset(("rib", "update")),
+        entries: Sequence[CollectorIndexEntry],
+        file_types: Iterable[Literal["rib", "update"]] = FILE_TYPES_BOTH,
         db_path: Path | None = None,
         force_cache_refresh: bool = False,
+        out_queue: asyncio.Queue[CollectorFileEntry] | None = None,
+        select: FileEntrySelector | None = None,
+        concurrency: int = INDEX_CONCURRENCY,
     ):
+        """Initialize the index worker.
+
+        Args:
+            session: HTTP session used to download the indexes
+            entries: Index entries to process
+            file_types: File types to keep, indexes without these types are skipped
+            db_path: Path to the index cache database
+            force_cache_refresh: Ignore the cached indexes
+            out_queue: Optional queue that file entries are put on as soon as
+                their index is processed (e.g. a DownloadWorker queue)
+            select: Optional filter for the entries put on out_queue
+            concurrency: Maximum number of concurrent index downloads (default: 16)
+        """
         self.session = session
-        self.queue = queue
+        self.entries = list(entries)
         self.results = []
         self.file_types = frozenset(file_types)
         self.db_path = db_path
         self.force_cache_refresh = force_cache_refresh
         self.retry_helper = RetryHelper()
-
-    async def run(self) -> int:
-        # Drain all entries from queue into a list for batch processing
-        entries_to_process = []
-        while not self.queue.empty():
-            entry = await self.queue.get()
+        self.out_queue = out_queue
+        self.select = select
+        self.concurrency = concurrency
+
+    async def _emit(self, file_entries: list[CollectorFileEntry]) -> None:
+        self.results.extend(file_entries)
+        if self.out_queue is None:
+            return
+
+        for file_entry in self.select(file_entries) if self.select else file_entries:
+            await self.out_queue.put(file_entry)
+
+    def _selected(
+        self, entries: Iterable[CollectorIndexEntry]
+    ) -> list[CollectorIndexEntry]:
+        selected = []
+        for entry in entries:
             if not entry.file_types & self.file_types:
                 LOG.debug(
                     "Skipping index %s, contains %s (want: %s)",
@@ -499,83 +779,127 @@ class IndexWorker:
                     entry.file_types,
                     self.file_types,
                 )
-                self.queue.task_done()
                 continue
-            entries_to_process.append(entry)
+            selected.append(entry)
+        return selected
+
+    async def _download_index(
+        self, index_entry: CollectorIndexEntry
+    ) -> list[CollectorFileEntry]:
+        """Download and parse an index, parsing each chunk as it is received."""
+        async with self.session.get(index_entry.url) as response:
+            if response.status != 200:
+                LOG.error(
+                    "Failed to download index %s: HTTP %d for %s",
+                    index_entry.url,
+                    response.status,
+                    index_entry.collector,
+                )
+                raise aiohttp.ClientResponseError(
+                    request_info=response.request_info,
+                    history=response.history,
+                    status=response.status,
+                    message=f"HTTP {response.status}",
+                    headers=response.headers,
+                )
+
+            # A new parser per attempt, a retry starts from the beginning
+            parser = IndexEntryParser(index_entry)
+            decoder = incremental_decoder(response.charset)()
+            file_entries: list[CollectorFileEntry] = []
+            while data := await response.content.readany():
+                file_entries.extend(parser.feed(decoder.decode(data)))
+            file_entries.extend(parser.feed(decoder.decode(b"", final=True)))
+            file_entries.extend(parser.close())
+            return file_entries
+
+    async def _fetch_one(
+        self,
+        index_entry: CollectorIndexEntry,
+        month_end: datetime,
+        batch_cache: dict[str, list[CollectorFileEntry]],
+        semaphore: asyncio.Semaphore,
+    ) -> list[CollectorFileEntry]:
+        # Check if this entry is in batch cache
+        if index_entry.url in batch_cache:
+            # Use cached file entries
+            cached_entries = batch_cache[index_entry.url]
+            LOG.debug(
+                f"Using cached index for {index_entry.url} ({len(cached_entries)} files)"
+            )
+            await self._emit(cached_entries)
+            return cached_entries
+
+        # Download and parse fresh content with retry logic
+        async with semaphore:
+            file_entries = await self.retry_helper.execute(
+                functools.partial(self._download_index, index_entry),
+                f"Download index {index_entry.url}",
+            )
+
+        # Store parsed entries in cache
+        await store_index(index_entry.url, file_entries, month_end, self.db_path)
 
-        if not entries_to_process:
-            return 0
+        await self._emit(file_entries)
+        return file_entries
 
-        # Build list of (url, month_end_date) for batch cache lookup
-        urls_with_dates = [
-            (
-                entry.url,
-                get_month_end_date(entry.time_period.year, entry.time_period.month),
+    async def _fetch_selected(
+        self, entries: list[CollectorIndexEntry], concurrency: int
+    ) -> list[CollectorFileEntry]:
+        if not entries:
+            return []
+
+        # Month end date per url, for the batch cache lookup and for storage
+        month_end_by_url = {
+            entry.url: get_month_end_date(
+                entry.time_period.year, entry.time_period.month
             )
-            for entry in entries_to_process
-        ]
+            for entry in entries
+        }
+        urls_with_dates = list(month_end_by_url.items())
 
         # Batch fetch all cached indexes
         batch_cache = await get_cached_indexes_batch(
             urls_with_dates, self.force_cache_refresh, self.db_path
         )
 
-        # Process each entry
-        processed = 0
-        for index_entry in entries_to_process:
-            processed += 1
-            try:
-                # Check if this entry is in batch cache
-                if index_entry.url in batch_cache:
-                    # Use cached file entries
-                    cached_entries = batch_cache[index_entry.url]
-                    LOG.debug(
-                        f"Using cached index for {index_entry.url} ({len(cached_entries)} files)"
-                    )
-                    self.results.extend(cached_entries)
-                else:
-                    # Download and parse fresh content with retry logic
-                    async def download_index():
-                        async with self.session.get(index_entry.url) as response:
-                            if response.status != 200:
-                                LOG.error(
-                                    "Failed to download index %s: HTTP %d for %s",
-                                    index_entry.url,
-                                    response.status,
-                                    index_entry.collector,
-                                )
-                                raise aiohttp.ClientResponseError(
-                                    request_info=response.request_info,
-                                    history=response.history,
-                                    status=response.status,
-                                    message=f"HTTP {response.status}",
-                                    headers=response.headers,
-                                )
-                            return await response.text()
-
-                    content = await self.retry_helper.execute(
-                        download_index, f"Download index {index_entry.url}"
-                    )
-
-                    # Parse the index
-                    file_entries = process_index_entry(index_entry, content)
+        # Download the remaining indexes concurrently, bounded by the semaphore
+        semaphore = asyncio.Semaphore(concurrency)
+        tasks = [
+            asyncio.create_task(
+                self._fetch_one(
+                    entry, month_end_by_url[entry.url], batch_cache, semaphore
+                )
+            )
+            for entry in entries
+        ]
 
-                    # Calculate month end date for storage
-                    month_end_date = get_month_end_date(
-                        index_entry.time_period.year, index_entry.time_period.month
-                    )
+        file_entries: list[CollectorFileEntry] = []
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, BaseException):
+                LOG.error(result)
+            else:
+                file_entries.extend(result)
+        return file_entries
 
-                    # Store parsed entries in cache
-                    await store_index(
-                        index_entry.url, file_entries, month_end_date, self.db_path
-                    )
+    async def fetch_all(
+        self,
+        entries: Iterable[CollectorIndexEntry],
+        concurrency: int = INDEX_CONCURRENCY,
+    ) -> list[CollectorFileEntry]:
+        """
+        Fetch the indexes for entries concurrently, returning their file entries.
 
-                    self.results.extend(file_entries)
-            except Exception as e:
-                LOG.error(e)
+        Failed indexes are logged and skipped. The file entries are also added to
+        `results` (and out_queue) as each index completes.
+        """
+        return await self._fetch_selected(self._selected(entries), concurrency)
 
-        # Mark all queue items as done
-        for _ in entries_to_process:
-            self.queue.task_done()
+    async def run(self) -> int:
+        """Process the pending index entries, returning the number processed."""
+        # Take all pending entries, so concurrent/repeated runs do not process them twice
+        entries, self.entries = self.entries, []
 
-        return processed
+        entries_to_process = self._selected(entries)
+        await self._fetch_selected(entries_to_process, self.concurrency)
+        return len(entries_to_process)
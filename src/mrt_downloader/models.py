@@ -1,11 +1,10 @@
 import datetime
 import re
-from dataclasses import dataclass
-from pathlib import Path
+from dataclasses import dataclass, field
 from typing import Literal
 
 MRT_FILENAME_PATTERN = re.compile(
-    r"^(?:bview|view|updates|rib)\.(\d{8}\.\d{4})\.(?:gz|bz2)$"
+    r"^(?:bview|view|updates|rib)\.(\d{4})(\d{2})(\d{2})\.(\d{2})(\d{2})\.(?:gz|bz2)$"
 )
 
 
@@ -14,15 +13,18 @@ def parse_mrt_filename_date(filename: str) -> datetime.datetime | None:
     if not match:
         return None
 
+    # The fixed-width YYYYMMDD.HHMM fields are converted directly, strptime is
+    # much slower and this runs for every file in an index.
+    year, month, day, hour, minute = match.groups()
     try:
-        return datetime.datetime.strptime(match.group(1), "%Y%m%d.%H%M").replace(
-            tzinfo=datetime.UTC
+        return datetime.datetime(
+            int(year), int(month), int(day), int(hour), int(minute), tzinfo=datetime.UTC
         )
     except ValueError:
         return None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CollectorInfo:
     name: str
     project: Literal["ris", "routeviews"]
@@ -31,7 +33,7 @@ class CollectorInfo:
     removed: datetime.datetime | None = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CollectorIndexEntry:
     """An entry for a file listing for a collector."""
 
@@ -41,7 +43,7 @@ class CollectorIndexEntry:
     file_types: frozenset[Literal["rib", "update"]] = frozenset()
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CollectorFileEntry:
     collector: CollectorInfo
     filename: str
@@ -49,6 +51,11 @@ class CollectorFileEntry:
 
     file_type: Literal["rib", "update"] | None = None
 
+    # Cache for `date`, cached_property needs a __dict__.
+    _date: datetime.datetime | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     @property
     def date(self) -> datetime.datetime:
         """
@@ -56,15 +63,13 @@ class CollectorFileEntry:
 
         @raise ValueError if the date cannot be parsed
         """
+        if self._date is not None:
+            return self._date
+
         date = parse_mrt_filename_date(self.filename)
         if date is None:
             raise ValueError(
                 f"Could not parse MRT filename date from {self.filename!r}"
             )
+        object.__setattr__(self, "_date", date)
         return date
-
-
-@dataclass
-class Download:
-    url: str
-    target_file: Path
@@ -0,0 +1,25 @@
+import datetime
+from collections import Counter
+from collections.abc import Iterable
+from operator import attrgetter
+
+from mrt_downloader.models import CollectorFileEntry
+
+_fields = attrgetter("url", "date", "file_type")
+
+
+def summarize(
+    entries: Iterable[CollectorFileEntry],
+) -> tuple[set[str], set[datetime.datetime], Counter[str]]:
+    """Collect the unique urls, unique dates and file type counts in one pass.
+
+    The attribute lookups run in C (`map` over an `attrgetter`).
+    """
+    urls: set[str] = set()
+    dates: set[datetime.datetime] = set()
+    types: Counter[str] = Counter()
+    for url, date, file_type in map(_fields, entries):
+        urls.add(url)
+        dates.add(date)
+        types[file_type] += 1
+    return urls, dates, types
@@ -1,146 +1,159 @@
-import asyncio
 import datetime
-from collections import Counter
+from pathlib import Path
 
+import aiohttp
 import pytest
 
-from mrt_downloader.http import IndexWorker, build_session
+from mrt_downloader.collector_index import (
+    FILE_TYPES_BOTH,
+    FILE_TYPES_RIB,
+    FILE_TYPES_UPDATE,
+)
+from mrt_downloader.http import IndexWorker
 from mrt_downloader.models import CollectorIndexEntry, CollectorInfo
+from tests._helpers import summarize
 from tests.collector_index_test import (  # noqa: F401
     ris_collectors,
+    ris_collectors_by_name,
     routeviews_collectors,
+    routeviews_collectors_by_name,
 )
 
 
-@pytest.mark.asyncio
-async def test_get_file_entries_ris(ris_collectors: list[CollectorInfo]):  # noqa: F811
-    async with build_session() as sess:
-        index_queue = asyncio.Queue()
-
-        worker = IndexWorker(sess, index_queue)
-        index_queue.put_nowait(
+@pytest.mark.integration
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("concurrency", [1, 4])
+async def test_get_file_entries_ris(
+    concurrency: int,
+    tmp_path: Path,
+    shared_session: aiohttp.ClientSession,
+    ris_collectors_by_name: dict[str, CollectorInfo],  # noqa: F811
+):
+    worker = IndexWorker(
+        shared_session,
+        [
             CollectorIndexEntry(
-                [r for r in ris_collectors if r.name == "RRC00"][0],
+                ris_collectors_by_name["RRC00"],
                 "https://data.ris.ripe.net/rrc00/2025.04/",
                 datetime.datetime(2025, 4, 1, tzinfo=datetime.UTC),
-                file_types=frozenset({"rib", "update"}),
-            )
-        )
-        index_queue.put_nowait(
+                file_types=FILE_TYPES_BOTH,
+            ),
             CollectorIndexEntry(
-                [r for r in ris_collectors if r.name == "RRC25"][0],
+                ris_collectors_by_name["RRC25"],
                 "https://data.ris.ripe.net/rrc25/2025.04/",
                 datetime.datetime(2025, 4, 1, tzinfo=datetime.UTC),
-                file_types=frozenset({"rib", "update"}),
-            )
-        )
-
-        status = await asyncio.gather(
-            worker.run(),
-            worker.run(),
-        )
-        assert sum(status) == 2
-
-        # We have indices for two collectors, each with ribs and updates
-        assert len(worker.results) > 2 * 28 * 24 * 12
-
-        # All urls are unique
-        unique_urls = set(x.url for x in worker.results)
-        assert len(unique_urls) == len(worker.results)
-        # dates are slightly below 0.5x the number of unique entries, since they overlap
-        # between collectors. And that ribs overlap with updates.
-        unique_dates = set(x.date for x in worker.results)
-        assert 0.4 * len(worker.results) < len(unique_dates) < 0.5 * len(worker.results)
-
-        # We have both typs
-        type_count = Counter(x.file_type for x in worker.results)
-        assert type_count["rib"] > 2 * 28 * 3
-        assert type_count["update"] > 2 * 28 * 24 * 12
-
-
-@pytest.mark.asyncio
-async def test_get_file_entries_routeviews(routeviews_collectors: list[CollectorInfo]):  # noqa: F811
-    bknix = [r for r in routeviews_collectors if r.name == "route-views.bknix"][0]
-    async with build_session() as sess:
-        index_queue = asyncio.Queue()
-
-        worker = IndexWorker(sess, index_queue)
-        index_queue.put_nowait(
+                file_types=FILE_TYPES_BOTH,
+            ),
+        ],
+        # a fresh cache, so each run downloads the indexes
+        db_path=tmp_path / "cache.sqlite3",
+        concurrency=concurrency,
+    )
+
+    assert await worker.run() == 2
+
+    # We have indices for two collectors, each with ribs and updates
+    assert len(worker.results) > 2 * 28 * 24 * 12
+
+    unique_urls, unique_dates, type_count = summarize(worker.results)
+
+    # All urls are unique
+    assert len(unique_urls) == len(worker.results)
+    # dates are slightly below 0.5x the number of unique entries, since they overlap
+    # between collectors. And that ribs overlap with updates.
+    assert 0.4 * len(worker.results) < len(unique_dates) < 0.5 * len(worker.results)
+
+    # We have both typs
+    assert type_count["rib"] > 2 * 28 * 3
+    assert type_count["update"] > 2 * 28 * 24 * 12
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("concurrency", [1, 4])
+async def test_get_file_entries_routeviews(
+    concurrency: int,
+    tmp_path: Path,
+    shared_session: aiohttp.ClientSession,
+    routeviews_collectors_by_name: dict[str, CollectorInfo],  # noqa: F811
+):
+    bknix = routeviews_collectors_by_name["route-views.bknix"]
+    worker = IndexWorker(
+        shared_session,
+        [
             CollectorIndexEntry(
                 bknix,
                 "https://archive.routeviews.org/route-views.bknix/bgpdata/2025.04/RIBS/",
                 datetime.datetime(2025, 4, 1, tzinfo=datetime.UTC),
-                file_types=frozenset({"rib"}),
-            )
-        )
-        index_queue.put_nowait(
+                file_types=FILE_TYPES_RIB,
+            ),
             CollectorIndexEntry(
                 bknix,
                 "https://archive.routeviews.org/route-views.bknix/bgpdata/2025.04/UPDATES/",
                 datetime.datetime(2025, 4, 1, tzinfo=datetime.UTC),
-                file_types=frozenset({"update"}),
-            )
-        )
-
-        status = await asyncio.gather(
-            worker.run(),
-            worker.run(),
-        )
-        assert sum(status) == 2
-
-        # We have indices for one collector, with ribs and updates
-        assert len(worker.results) > 28 * 24 * 4
-
-        # All urls are unique
-        unique_urls = set(x.url for x in worker.results)
-        assert len(unique_urls) == len(worker.results)
-        # dates are slightly below 0.5x the number of unique entries, since they overlap
-        # between collectors. And that ribs overlap with updates.
-        unique_dates = set(x.date for x in worker.results)
-        assert len(unique_dates) == len(
-            [x for x in worker.results if x.file_type == "update"]
-        )
-
-        # We have both typs
-        type_count = Counter(x.file_type for x in worker.results)
-        assert type_count["rib"] > 28 * 12
-        assert type_count["update"] > 28 * 24 * 4
-
-
-@pytest.mark.asyncio
+                file_types=FILE_TYPES_UPDATE,
+            ),
+        ],
+        # a fresh cache, so each run downloads the indexes
+        db_path=tmp_path / "cache.sqlite3",
+        concurrency=concurrency,
+    )
+
+    assert await worker.run() == 2
+
+    # We have indices for one collector, with ribs and updates
+    assert len(worker.results) > 28 * 24 * 4
+
+    unique_urls, unique_dates, type_count = summarize(worker.results)
+
+    # All urls are unique
+    assert len(unique_urls) == len(worker.results)
+    # dates are slightly below 0.5x the number of unique entries, since they overlap
+    # between collectors. And that ribs overlap with updates.
+    assert len(unique_dates) == type_count["update"]
+
+    # We have both typs
+    assert type_count["rib"] > 28 * 12
+    assert type_count["update"] > 28 * 24 * 4
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("concurrency", [1, 4])
 async def test_get_file_entries_routeviews_ribs(
-    routeviews_collectors: list[CollectorInfo],  # noqa: F811
+    concurrency: int,
+    tmp_path: Path,
+    shared_session: aiohttp.ClientSession,
+    routeviews_collectors_by_name: dict[str, CollectorInfo],  # noqa: F811
 ):
-    bknix = [r for r in routeviews_collectors if r.name == "route-views.bknix"][0]
-
-    async with build_session() as sess:
-        index_queue = asyncio.Queue()
+    bknix = routeviews_collectors_by_name["route-views.bknix"]
 
-        worker = IndexWorker(sess, index_queue, file_types=frozenset(("rib",)))
-        index_queue.put_nowait(
+    worker = IndexWorker(
+        shared_session,
+        [
             CollectorIndexEntry(
                 bknix,
                 "https://archive.routeviews.org/route-views.bknix/bgpdata/2025.04/RIBS/",
                 datetime.datetime(2025, 4, 1, tzinfo=datetime.UTC),
-                file_types=frozenset({"rib"}),
-            )
-        )
-        index_queue.put_nowait(
+                file_types=FILE_TYPES_RIB,
+            ),
             CollectorIndexEntry(
                 bknix,
                 "https://archive.routeviews.org/route-views.bknix/bgpdata/2025.04/UPDATES/",
                 datetime.datetime(2025, 4, 1, tzinfo=datetime.UTC),
-                file_types=frozenset({"update"}),
-            )
-        )
-
-        status = await asyncio.gather(
-            worker.run(),
-        )
-        # one was skipped because it contains updates only.
-        assert sum(status) == 1
-
-        # all entries are ribs
-        type_count = Counter(x.file_type for x in worker.results)
-        assert type_count["rib"] > 28 * 12
-        assert type_count["rib"] == len(worker.results)
+                file_types=FILE_TYPES_UPDATE,
+            ),
+        ],
+        file_types=FILE_TYPES_RIB,
+        # a fresh cache, so each run downloads the indexes
+        db_path=tmp_path / "cache.sqlite3",
+        concurrency=concurrency,
+    )
+
+    # one was skipped because it contains updates only.
+    assert await worker.run() == 1
+
+    # all entries are ribs
+    _, _, type_count = summarize(worker.results)
+    assert type_count["rib"] > 28 * 12
+    assert type_count["rib"] == len(worker.results)
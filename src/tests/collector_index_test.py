@@ -1,4 +1,5 @@
 import datetime
+import functools
 import json
 import logging
 from pathlib import Path
@@ -6,6 +7,10 @@ from pathlib import Path
 import pytest
 
 from mrt_downloader.collector_index import (
+    FILE_TYPES_BOTH,
+    FILE_TYPES_RIB,
+    FILE_TYPES_UPDATE,
+    IndexEntryParser,
     index_files_for_collector,
     process_index_entry,
 )
@@ -14,30 +19,55 @@ from mrt_downloader.collectors import (
     parse_routeviews_collectors,
 )
 from mrt_downloader.models import CollectorIndexEntry, CollectorInfo
+from tests._helpers import summarize
 
+_FIXTURE_DIR = Path("src/tests/fixtures")
 
-@pytest.fixture
-def routeviews_collectors() -> list[CollectorInfo]:
-    with Path("src/tests/fixtures/api-routeviews-meta-collectors.json").open(
-        "r", encoding="utf-8"
-    ) as f:
-        data = json.load(f)
-        return parse_routeviews_collectors(data)
 
+@functools.lru_cache(maxsize=None)
+def _fixture_bytes(name: str) -> bytes:
+    return (_FIXTURE_DIR / name).read_bytes()
 
-@pytest.fixture
-def ris_collectors() -> list[CollectorInfo]:
-    with Path("src/tests/fixtures/stat-ripe-net-data-rrc-info-data.json").open(
-        "r", encoding="utf-8"
-    ) as f:
-        data = json.load(f)
-        return parse_ripe_ris_collectors(data)
+
+@functools.lru_cache(maxsize=1)
+def _load_routeviews_raw() -> dict:
+    return json.loads(_fixture_bytes("api-routeviews-meta-collectors.json"))
+
+
+@functools.lru_cache(maxsize=1)
+def _load_ris_raw() -> dict:
+    return json.loads(_fixture_bytes("stat-ripe-net-data-rrc-info-data.json"))
+
+
+# The collector lists are shared by all tests, tuples keep them from being mutated.
+@pytest.fixture(scope="session")
+def routeviews_collectors() -> tuple[CollectorInfo, ...]:
+    return tuple(parse_routeviews_collectors(_load_routeviews_raw()))
+
+
+@pytest.fixture(scope="session")
+def ris_collectors() -> tuple[CollectorInfo, ...]:
+    return tuple(parse_ripe_ris_collectors(_load_ris_raw()))
+
+
+@pytest.fixture(scope="session")
+def routeviews_collectors_by_name(
+    routeviews_collectors: tuple[CollectorInfo, ...],
+) -> dict[str, CollectorInfo]:
+    return {c.name: c for c in routeviews_collectors}
+
+
+@pytest.fixture(scope="session")
+def ris_collectors_by_name(
+    ris_collectors: tuple[CollectorInfo, ...],
+) -> dict[str, CollectorInfo]:
+    return {c.name: c for c in ris_collectors}
 
 
 def test_parse_routeviews_collectors_keeps_active_collectors_unbounded(
-    routeviews_collectors: list[CollectorInfo],
+    routeviews_collectors_by_name: dict[str, CollectorInfo],
 ) -> None:
-    bknix = [c for c in routeviews_collectors if c.name == "route-views.bknix"][0]
+    bknix = routeviews_collectors_by_name["route-views.bknix"]
 
     assert bknix.project == "routeviews"
     assert bknix.base_url == "https://archive.routeviews.org/route-views.bknix/bgpdata/"
@@ -71,7 +101,7 @@ def test_process_index_entry_skips_malformed_mrt_filenames(
         RRC08_COLLECTOR,
         "https://data.ris.ripe.net/rrc08/2026.05/",
         datetime.datetime(2026, 5, 1, tzinfo=datetime.UTC),
-        file_types=frozenset({"update"}),
+        file_types=FILE_TYPES_UPDATE,
     )
     html = """
     <a href="updates.20260521.1500.gz">updates.20260521.1500.gz</a>
@@ -88,8 +118,31 @@ def test_process_index_entry_skips_malformed_mrt_filenames(
     )
 
 
+def test_index_entry_parser_handles_split_chunks() -> None:
+    index_entry = CollectorIndexEntry(
+        RRC08_COLLECTOR,
+        "https://data.ris.ripe.net/rrc08/2026.05/",
+        datetime.datetime(2026, 5, 1, tzinfo=datetime.UTC),
+        file_types=FILE_TYPES_UPDATE,
+    )
+    html = (
+        '<a href="updates.20260521.1500.gz">updates.20260521.1500.gz</a>'
+        '<a href="updates.20260521.1505.gz">updates.20260521.1505.gz</a>'
+    )
+    parser = IndexEntryParser(index_entry)
+
+    # the second link is split halfway through its href
+    split = html.index("1505")
+    first = parser.feed(html[:split])
+    second = parser.feed(html[split:]) + parser.close()
+
+    assert [entry.filename for entry in first] == ["updates.20260521.1500.gz"]
+    assert [entry.filename for entry in second] == ["updates.20260521.1505.gz"]
+    assert first + second == process_index_entry(index_entry, html)
+
+
 def test_index_files_for_collector_routeviews(
-    routeviews_collectors: list[CollectorInfo],
+    routeviews_collectors: tuple[CollectorInfo, ...],
 ) -> None:
     # Get index files for January/February 2024
     index_files = index_files_for_collector(
@@ -114,9 +167,9 @@ def test_index_files_for_collector_routeviews(
 
 
 def test_index_files_for_routeviews_includes_first_partial_month(
-    routeviews_collectors: list[CollectorInfo],
+    routeviews_collectors_by_name: dict[str, CollectorInfo],
 ) -> None:
-    routeviews8 = [c for c in routeviews_collectors if c.name == "route-views8"][0]
+    routeviews8 = routeviews_collectors_by_name["route-views8"]
 
     index_files = index_files_for_collector(
         routeviews8,
@@ -131,9 +184,9 @@ def test_index_files_for_routeviews_includes_first_partial_month(
 
 
 def test_index_files_for_routeviews_includes_month_after_latest_dump_metadata(
-    routeviews_collectors: list[CollectorInfo],
+    routeviews_collectors_by_name: dict[str, CollectorInfo],
 ) -> None:
-    bknix = [c for c in routeviews_collectors if c.name == "route-views.bknix"][0]
+    bknix = routeviews_collectors_by_name["route-views.bknix"]
 
     index_files = index_files_for_collector(
         bknix,
@@ -147,7 +200,7 @@ def test_index_files_for_routeviews_includes_month_after_latest_dump_metadata(
     ]
 
 
-def test_index_files_for_ris(ris_collectors: list[CollectorInfo]) -> None:
+def test_index_files_for_ris(ris_collectors: tuple[CollectorInfo, ...]) -> None:
     # Get index files for January/February 2024
     index_files = index_files_for_collector(
         ris_collectors[0],
@@ -171,21 +224,19 @@ def test_parse_index_file_routeviews_ribs() -> None:
         BKNIX_COLLECTOR,
         "https://archive.routeviews.org/route-views.bknix/bgpdata/2020.04/RIBS/",
         datetime.datetime(2020, 4, 1, tzinfo=datetime.UTC),
-        file_types=frozenset({"rib"}),
+        file_types=FILE_TYPES_RIB,
     )
-    with Path("src/tests/fixtures/route-views-bknix-bgpdata-2020.04-ribs.html").open(
-        "r", encoding="utf-8"
-    ) as f:
-        entries = process_index_entry(index_entry, f.read())
-        assert len(entries) > 28 * 12
+    entries = process_index_entry(
+        index_entry,
+        _fixture_bytes("route-views-bknix-bgpdata-2020.04-ribs.html"),
+    )
+    assert len(entries) > 28 * 12
 
-        urls = set(x.url for x in entries)
-        dates = set(x.date for x in entries)
-        types = set(x.file_type for x in entries)
+    urls, dates, types = summarize(entries)
 
-        assert types == {"rib"}
+    assert types.keys() == {"rib"}
 
-        assert len(entries) == len(urls) == len(dates)
+    assert len(entries) == len(urls) == len(dates)
 
 
 def test_parse_index_file_routeviews_updates() -> None:
@@ -193,21 +244,19 @@ def test_parse_index_file_routeviews_updates() -> None:
         BKNIX_COLLECTOR,
         "https://archive.routeviews.org/route-views.bknix/bgpdata/2020.04/UPDATES/",
         datetime.datetime(2020, 4, 1, tzinfo=datetime.UTC),
-        file_types=frozenset({"rib"}),
+        file_types=FILE_TYPES_RIB,
+    )
+    entries = process_index_entry(
+        index_entry,
+        _fixture_bytes("route-views-bknix-bgpdata-2020.04-updates.html"),
     )
-    with Path("src/tests/fixtures/route-views-bknix-bgpdata-2020.04-updates.html").open(
-        "r", encoding="utf-8"
-    ) as f:
-        entries = process_index_entry(index_entry, f.read())
-        assert len(entries) > 28 * 24 * 4  # 4 updates per hour
+    assert len(entries) > 28 * 24 * 4  # 4 updates per hour
 
-        urls = set(x.url for x in entries)
-        dates = set(x.date for x in entries)
-        types = set(x.file_type for x in entries)
+    urls, dates, types = summarize(entries)
 
-        assert types == {"update"}
+    assert types.keys() == {"update"}
 
-        assert len(entries) == len(urls) == len(dates)
+    assert len(entries) == len(urls) == len(dates)
 
 
 def test_parse_index_file_ris() -> None:
@@ -215,20 +264,15 @@ def test_parse_index_file_ris() -> None:
         RRC08_COLLECTOR,
         "https://data.ris.ripe.net/rrc08/2020.04/",
         datetime.datetime(2020, 4, 1, tzinfo=datetime.UTC),
-        file_types=frozenset({"rib", "update"}),
+        file_types=FILE_TYPES_BOTH,
     )
-    with Path("src/tests/fixtures/ris-rrc08-2020.04.html").open(
-        "r", encoding="utf-8"
-    ) as f:
-        entries = process_index_entry(index_entry, f.read())
-        assert len(entries) > 24 * 12 + 3  # 12 updates per hour + 3 bviews.
+    entries = process_index_entry(index_entry, _fixture_bytes("ris-rrc08-2020.04.html"))
+    assert len(entries) > 24 * 12 + 3  # 12 updates per hour + 3 bviews.
 
-        urls = set(x.url for x in entries)
-        dates = set(x.date for x in entries)
-        types = set(x.file_type for x in entries)
+    urls, dates, types = summarize(entries)
 
-        assert types == {"update", "rib"}
+    assert types.keys() == {"update", "rib"}
 
-        assert len(entries) == len(urls)
-        # all the ribs will have the same date as update
-        assert len(dates) == len([e for e in entries if e.file_type == "update"])
+    assert len(entries) == len(urls)
+    # all the ribs will have the same date as update
+    assert len(dates) == types["update"]
@@ -1,58 +1,76 @@
+from collections.abc import Awaitable, Callable
 from datetime import UTC, datetime
+from pathlib import Path
 
 import aiohttp
 import pytest
-import pytest_asyncio
 
+from mrt_downloader.cache import get_cached_collectors, store_collectors
 from mrt_downloader.collectors import (
     get_ripe_ris_collectors,
     get_routeviews_collectors,
 )
-from mrt_downloader.http import build_session
 from mrt_downloader.models import CollectorInfo
 
 
-@pytest_asyncio.fixture
-async def session() -> aiohttp.ClientSession:
-    """Create a test aiohttp client session."""
-    return build_session()
+async def _cached_collectors(
+    project: str,
+    fetch: Callable[[aiohttp.ClientSession], Awaitable[list[CollectorInfo]]],
+    session: aiohttp.ClientSession,
+    db_path: Path | None,
+) -> list[CollectorInfo]:
+    """Fetch the collectors, going through the cache with --collector-cache."""
+    if db_path is not None:
+        cached = await get_cached_collectors(project, db_path=db_path)
+        if cached:
+            return cached
 
+    collectors = await fetch(session)
+    if db_path is not None:
+        await store_collectors(project, collectors, db_path=db_path)
+    return collectors
 
-@pytest.mark.asyncio
-async def test_get_ripe_ris_collectors(session: aiohttp.ClientSession):
+
+@pytest.mark.integration
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_ripe_ris_collectors(
+    shared_session: aiohttp.ClientSession, collector_cache_db: Path | None
+):
     """Get the collectors and do some sanity checks."""
-    async with session as sess:
-        collectors = await get_ripe_ris_collectors(sess)
+    collectors = await _cached_collectors(
+        "ris", get_ripe_ris_collectors, shared_session, collector_cache_db
+    )
 
-        assert len(collectors) > 10
-        rrc00: CollectorInfo = [c for c in collectors if c.name == "RRC00"][0]
+    assert len(collectors) > 10
+    rrc00: CollectorInfo = next(c for c in collectors if c.name == "RRC00")
 
-        assert rrc00.name == "RRC00"
-        assert rrc00.project == "ris"
-        assert rrc00.base_url == "https://data.ris.ripe.net/rrc00/"
-        assert rrc00.installed == datetime(1999, 10, 1, tzinfo=UTC)
-        assert rrc00.removed is None
+    assert rrc00.name == "RRC00"
+    assert rrc00.project == "ris"
+    assert rrc00.base_url == "https://data.ris.ripe.net/rrc00/"
+    assert rrc00.installed == datetime(1999, 10, 1, tzinfo=UTC)
+    assert rrc00.removed is None
 
-        # Now get a deactivated collector
-        deactivated_rrc: CollectorInfo = [c for c in collectors if c.name == "RRC02"][0]
-        assert deactivated_rrc.removed == datetime(2008, 11, 1, tzinfo=UTC)
+    # Now get a deactivated collector
+    deactivated_rrc: CollectorInfo = next(c for c in collectors if c.name == "RRC02")
+    assert deactivated_rrc.removed == datetime(2008, 11, 1, tzinfo=UTC)
 
 
-@pytest.mark.asyncio
-async def test_get_routeviews_collectors(session: aiohttp.ClientSession):
+@pytest.mark.integration
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_routeviews_collectors(
+    shared_session: aiohttp.ClientSession, collector_cache_db: Path | None
+):
     """Get the RouteViews collectors and do some sanity checks."""
-    async with session as sess:
-        collectors = await get_routeviews_collectors(sess)
-
-        assert len(collectors) >= 50
-        routeviews8: CollectorInfo = [
-            c for c in collectors if c.name == "route-views8"
-        ][0]
-
-        assert routeviews8.name == "route-views8"
-        assert routeviews8.project == "routeviews"
-        assert (
-            routeviews8.base_url
-            == "https://archive.routeviews.org/route-views8/bgpdata/"
-        )
-        assert routeviews8.installed == datetime(2025, 3, 11, 18, 52, tzinfo=UTC)
+    collectors = await _cached_collectors(
+        "routeviews", get_routeviews_collectors, shared_session, collector_cache_db
+    )
+
+    assert len(collectors) >= 50
+    routeviews8: CollectorInfo = next(c for c in collectors if c.name == "route-views8")
+
+    assert routeviews8.name == "route-views8"
+    assert routeviews8.project == "routeviews"
+    assert (
+        routeviews8.base_url == "https://archive.routeviews.org/route-views8/bgpdata/"
+    )
+    assert routeviews8.installed == datetime(2025, 3, 11, 18, 52, tzinfo=UTC)
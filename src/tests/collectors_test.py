@@ -61,7 +61,7 @@ def install_fast_retry_helper(monkeypatch: pytest.MonkeyPatch) -> None:
     helper = RetryHelper(
         max_retries=1,
         initial_delay=0,
-        random_jitter=lambda _delay: 0,
+        random_uniform=lambda _low, _high: 0,
         sleep=sleep,
     )
     monkeypatch.setattr(collectors_module, "RetryHelper", lambda: helper)
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from mrt_downloader.concurrency import AdaptiveConcurrency
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_adaptive_concurrency_limits_in_flight_to_window() -> None:
+    concurrency = AdaptiveConcurrency(initial=2, maximum=4)
+    running = 0
+    peak = 0
+
+    async def transfer() -> None:
+        nonlocal running, peak
+        async with concurrency.slot():
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0)
+            running -= 1
+
+    await asyncio.gather(*(transfer() for _ in range(8)))
+
+    assert peak == 2
+    assert concurrency.in_flight == 0
+
+
+def test_adaptive_concurrency_halves_once_per_epoch_on_congestion() -> None:
+    concurrency = AdaptiveConcurrency(initial=8, minimum=2)
+
+    concurrency.record_congestion()
+    concurrency.record_congestion()
+    assert concurrency.window == 4
+
+    # After an epoch completes, the next congestion signal halves again.
+    for _ in range(4):
+        concurrency.record_transfer(1024)
+    concurrency.record_congestion()
+    assert concurrency.window == 2
+
+    for _ in range(4):
+        concurrency.record_transfer(1024)
+    concurrency.record_congestion()
+    assert concurrency.window == 2
+
+
+def test_adaptive_concurrency_grows_while_throughput_improves() -> None:
+    clock = FakeClock()
+    concurrency = AdaptiveConcurrency(initial=2, maximum=3, clock=clock)
+
+    # first epoch: no baseline yet, probe one step up
+    clock.now = 1.0
+    for _ in range(2):
+        concurrency.record_transfer(1000)
+    assert concurrency.window == 3
+    assert concurrency.throughput == 2000
+
+    # throughput drops: keep the window
+    clock.now = 3.0
+    for _ in range(3):
+        concurrency.record_transfer(1000)
+    assert concurrency.window == 3
+    assert concurrency.throughput == 1750
+
+    # never grows beyond the maximum
+    clock.now = 3.5
+    for _ in range(3):
+        concurrency.record_transfer(1000)
+    assert concurrency.window == 3
+
+
+@pytest.mark.asyncio
+async def test_adaptive_concurrency_wakes_waiters_when_window_grows() -> None:
+    concurrency = AdaptiveConcurrency(initial=1, maximum=2)
+    await concurrency.acquire()
+
+    waiter = asyncio.create_task(concurrency.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    # first epoch completes, window grows to 2 and the waiter gets a slot
+    concurrency.record_transfer(1024)
+    await asyncio.wait_for(waiter, timeout=1)
+    assert concurrency.in_flight == 2
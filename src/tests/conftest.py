@@ -0,0 +1,78 @@
+import asyncio
+from collections.abc import AsyncIterator, Callable, Mapping
+from pathlib import Path
+
+import aiohttp
+import pytest
+import pytest_asyncio
+
+from mrt_downloader.http import build_session
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+if uvloop is not None:
+
+    def pytest_asyncio_loop_factories(
+        config: pytest.Config, item: pytest.Item
+    ) -> Mapping[str, Callable[[], asyncio.AbstractEventLoop]]:
+        """Run the async tests on uvloop when it is installed."""
+        return {"uvloop": uvloop.new_event_loop}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--run-integration",
+        action="store_true",
+        help="run the integration tests, which use the live collector servers",
+    )
+    parser.addoption(
+        "--collector-cache",
+        action="store_true",
+        help="reuse the collector lists fetched by the integration tests "
+        "(stored in the pytest cache, refreshed after a day)",
+    )
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    if config.getoption("--run-integration"):
+        return
+
+    skip_integration = pytest.mark.skip(reason="needs --run-integration")
+    for item in items:
+        if "integration" in item.keywords:
+            item.add_marker(skip_integration)
+
+
+@pytest.fixture(scope="session")
+def collector_cache_db(
+    request: pytest.FixtureRequest, tmp_path_factory: pytest.TempPathFactory
+) -> Path | None:
+    """Cache database for the collector lists, None unless --collector-cache."""
+    if not request.config.getoption("--collector-cache"):
+        return None
+
+    cache = getattr(request.config, "cache", None)
+    if cache is None:
+        # cache provider disabled (-p no:cacheprovider): only reused in this run
+        return tmp_path_factory.getbasetemp() / "collectors.sqlite3"
+    return cache.mkdir("mrt_downloader") / "collectors.sqlite3"
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def shared_session() -> AsyncIterator[aiohttp.ClientSession]:
+    """
+    One HTTP session for the integration tests.
+
+    Keep-alive connections to the collector hosts are reused across tests. Tests
+    using it need to run in the session event loop:
+    `@pytest.mark.asyncio(loop_scope="session")`.
+    """
+    # a small per-host limit, the tests share the collector hosts
+    async with build_session(max_per_host=8) as session:
+        yield session
@@ -1,41 +1,88 @@
 import datetime
-import multiprocessing
+import os
 import pathlib
 
 import pytest  # type: ignore
 
-from mrt_downloader.download import download_files
+from mrt_downloader.download import download_files_stream
 from mrt_downloader.files import PrefixCollectorStrategy
 
+# downloads are network bound, do not tie the number of workers to the CPU count
+NUM_WORKERS = int(os.environ.get("MRT_TEST_WORKERS", "16"))
 
-@pytest.mark.asyncio
-async def test_mrt_download(tmp_path: pathlib.Path) -> None:
-    # Download a limited number of files
-    yesterday_midnight = (datetime.datetime.now() - datetime.timedelta(days=1)).replace(
+
+async def _download(
+    tmp_path: pathlib.Path,
+    start: datetime.datetime,
+    end: datetime.datetime,
+    collectors: list[str],
+) -> tuple[set[str], set[str]]:
+    """Download the window and return the names of the update and bview files."""
+    # assert on each file as it completes, on failure `finished` has the progress
+    finished: list[pathlib.Path] = []
+    async for path in download_files_stream(
+        tmp_path,
+        start,
+        end,
+        collectors=collectors,
+        num_workers=NUM_WORKERS,
+        naming_strategy=PrefixCollectorStrategy(),
+    ):
+        assert path.is_file(), f"{path} missing after {len(finished)} files"
+        finished.append(path)
+
+    # one scan of the download directory, instead of a glob per file type
+    with os.scandir(tmp_path) as it:
+        names = [entry.name for entry in it]
+    # there should be at least one update and one rib per collector
+    assert len(names) >= 2 * len(collectors), f"{start} - {end}: {sorted(names)}"
+    assert len(finished) == len(names)
+
+    update_files = {name for name in names if "updates" in name}
+    bview_files = {name for name in names if "bview" in name}
+    return update_files, bview_files
+
+
+@pytest.fixture(scope="session")
+def yesterday_midnight() -> datetime.datetime:
+    """Start of the download window, the same for all tests (and workers) in a run."""
+    return (datetime.datetime.now() - datetime.timedelta(days=1)).replace(
         hour=0, minute=0, second=0, microsecond=0, tzinfo=datetime.UTC
     )
-    yesterday_one_am = yesterday_midnight.replace(hour=1)
 
-    print(f"Download window: {yesterday_midnight} - {yesterday_one_am}")
 
-    # download from two RRCs..
-    await download_files(
-        tmp_path,
-        yesterday_midnight,
-        yesterday_one_am,
-        collectors=["rrc04", "rrc11"],
-        num_workers=multiprocessing.cpu_count(),
-        naming_strategy=PrefixCollectorStrategy(),
+@pytest.mark.integration
+@pytest.mark.asyncio
+@pytest.mark.parametrize("collector", ["rrc04", "rrc11"])
+async def test_mrt_download(
+    tmp_path: pathlib.Path, yesterday_midnight: datetime.datetime, collector: str
+) -> None:
+    # Download a single MRT interval
+    five_past_midnight = yesterday_midnight + datetime.timedelta(minutes=5)
+
+    update_files, bview_files = await _download(
+        tmp_path, yesterday_midnight, five_past_midnight, [collector]
     )
 
-    files = list(tmp_path.iterdir())
-    # there should be 2x13 (updates - beginning/end are inclusive) + 2 files (ribs)
-    # just the session
-    assert len(files) > 24
-    print(list(tmp_path.glob("*update*")))
+    # updates at the beginning and end of the window (inclusive), and the rib
+    assert len(bview_files) == 1
+    assert len(update_files) == 2
 
-    update_files = set(p.name for p in tmp_path.glob("*updates*"))
-    bview_files = set(p.name for p in tmp_path.glob("*bview*"))
 
+@pytest.mark.integration
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_mrt_download_hour(
+    tmp_path: pathlib.Path, yesterday_midnight: datetime.datetime
+) -> None:
+    # Download a full hour
+    yesterday_one_am = yesterday_midnight.replace(hour=1)
+
+    # download from two RRCs..
+    update_files, bview_files = await _download(
+        tmp_path, yesterday_midnight, yesterday_one_am, ["rrc04", "rrc11"]
+    )
+
+    # there should be 2x13 (updates - beginning/end are inclusive) + 2 files (ribs)
     assert len(bview_files) == 2
     assert len(update_files) == 26
@@ -1,10 +1,41 @@
 import datetime
+import itertools
 import logging
+from pathlib import Path
 
 import pytest
 
-from mrt_downloader.download import select_files_for_download
+import mrt_downloader.download as download_module
+from mrt_downloader.collector_index import FILE_TYPES_UPDATE
+from mrt_downloader.concurrency import AdaptiveConcurrency
+from mrt_downloader.download import download_files_stream, select_files_for_download
+from mrt_downloader.files import ByCollectorStrategy
 from mrt_downloader.models import CollectorFileEntry, CollectorInfo
+from tests.http_test import RIS_COLLECTOR, FakeResponse, FakeSession
+
+
+class FakePoolSession(FakeSession):
+    async def __aenter__(self) -> "FakePoolSession":
+        return self
+
+    async def __aexit__(self, _exc_type, _exc, _tb) -> None:
+        return None
+
+
+class RecordingConcurrency(AdaptiveConcurrency):
+    """Concurrency window with a clock that advances one second per reading."""
+
+    instances: list["RecordingConcurrency"] = []
+
+    def __init__(self, initial: int, maximum: int | None = None):
+        super().__init__(initial, maximum=maximum, clock=itertools.count().__next__)
+        self.initial = self.window
+        self.peak_in_flight = 0
+        RecordingConcurrency.instances.append(self)
+
+    async def acquire(self) -> None:
+        await super().acquire()
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
 
 
 def test_select_files_for_download_skips_malformed_cached_filename(
@@ -34,9 +65,58 @@ def test_select_files_for_download_skips_malformed_cached_filename(
             [valid_entry, malformed_entry],
             datetime.datetime(2026, 5, 21, 15, tzinfo=datetime.UTC),
             datetime.datetime(2026, 5, 21, 16, tzinfo=datetime.UTC),
-            frozenset({"update"}),
+            FILE_TYPES_UPDATE,
         )
 
     assert selected == [valid_entry]
     assert "Skipping file with invalid MRT filename" in caplog.text
     assert "updates.20260521.1503.bad.gz" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_download_files_stream_grows_concurrency_window(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    index_url = "https://data.ris.ripe.net/rrc00/2025.05/"
+    filenames = [f"updates.20250501.00{minute:02}.gz" for minute in range(0, 60, 5)]
+    responses = {
+        index_url: [
+            FakeResponse(
+                index_url,
+                200,
+                text="".join(f'<a href="{name}">{name}</a>' for name in filenames),
+            )
+        ]
+    }
+    for name in filenames:
+        responses[index_url + name] = [FakeResponse(index_url + name, 200, body=b"mrt")]
+    session = FakePoolSession(responses)
+
+    async def cached_collectors(*_args) -> list[CollectorInfo]:
+        return [RIS_COLLECTOR]
+
+    monkeypatch.setattr(
+        download_module, "get_cache_db_path", lambda: tmp_path / "cache.sqlite3"
+    )
+    monkeypatch.setattr(download_module, "get_cached_collectors", cached_collectors)
+    monkeypatch.setattr(download_module, "build_session", lambda **_kw: session)
+    monkeypatch.setattr(download_module, "AdaptiveConcurrency", RecordingConcurrency)
+    monkeypatch.setattr(RecordingConcurrency, "instances", [])
+
+    paths = [
+        path
+        async for path in download_files_stream(
+            tmp_path / "mrt",
+            datetime.datetime(2025, 5, 1, tzinfo=datetime.UTC),
+            datetime.datetime(2025, 5, 1, 0, 55, tzinfo=datetime.UTC),
+            num_workers=4,
+            naming_strategy=ByCollectorStrategy(),
+        )
+    ]
+
+    assert sorted(path.name for path in paths) == filenames
+    (concurrency,) = RecordingConcurrency.instances
+    # starts below num_workers, grows while throughput improves, up to num_workers
+    assert concurrency.initial == 2
+    assert concurrency.window == 4
+    assert concurrency.peak_in_flight > concurrency.initial
@@ -20,6 +20,11 @@ def test_split_on_dash_except_route_views() -> None:
         "route-views8-updates.20250613.2245.bz2"
     ) == ("route-views8", "updates.20250613.2245.bz2")
 
+    assert split_on_dash_except_route_views("route-views3-rib-x.bz2") == (
+        "route-views3",
+        "rib-x.bz2",
+    )
+
     assert split_on_dash_except_route_views("foo-bla.baz") == ("foo", "bla.baz")
 
 
@@ -2,10 +2,11 @@ import asyncio
 import datetime
 import pathlib
 
+import aiohttp
 import pytest
 
 from mrt_downloader.files import ByCollectorStrategy
-from mrt_downloader.http import DownloadWorker, build_session
+from mrt_downloader.http import DownloadWorker
 from mrt_downloader.models import CollectorFileEntry, CollectorInfo
 
 BKNIX = CollectorInfo(
@@ -32,25 +33,30 @@ DOWNLOADS = [
 ]
 
 
-@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.asyncio(loop_scope="session")
 async def test_download_worker(
-    tmp_path: pathlib.Path, caplog: pytest.LogCaptureFixture
+    tmp_path: pathlib.Path,
+    caplog: pytest.LogCaptureFixture,
+    shared_session: aiohttp.ClientSession,
 ) -> None:
-    async with build_session() as session:
-        naming_strategy = ByCollectorStrategy()
-        queue = asyncio.Queue()
-        worker = DownloadWorker(tmp_path, naming_strategy, session, queue)
-
-        queue.put_nowait(DOWNLOADS[0])
-        queue.put_nowait(DOWNLOADS[1])
-
-        # Run the worker
-        downloaded = await worker.run()
-        assert downloaded == 2
-
-        # Check if files were downloaded
-        for entry in DOWNLOADS:
-            file_path = naming_strategy.get_path(tmp_path, entry)
-            assert file_path.exists(), f"File {entry.filename} was not downloaded."
-            assert file_path.is_file(), f"{file_path} is not a file."
-            assert file_path.stat().st_size > 0, f"{file_path} is empty."
+    naming_strategy = ByCollectorStrategy()
+    queue = asyncio.Queue()
+    worker = DownloadWorker(tmp_path, naming_strategy, shared_session, queue)
+
+    queue.put_nowait(DOWNLOADS[0])
+    queue.put_nowait(DOWNLOADS[1])
+
+    # Run the worker until the queue is processed
+    task = asyncio.create_task(worker.run())
+    await queue.join()
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    assert worker.processed == 2
+
+    # Check if files were downloaded
+    for entry in DOWNLOADS:
+        file_path = naming_strategy.get_path(tmp_path, entry)
+        assert file_path.exists(), f"File {entry.filename} was not downloaded."
+        assert file_path.is_file(), f"{file_path} is not a file."
+        assert file_path.stat().st_size > 0, f"{file_path} is empty."
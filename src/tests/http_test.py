@@ -1,15 +1,31 @@
 import asyncio
 import datetime
-import email.utils
+import io
 import os
+import threading
 from pathlib import Path
 from types import SimpleNamespace
 
 import aiohttp
 import pytest
 
+import mrt_downloader.http as http_module
+from mrt_downloader.collector_index import (
+    FILE_TYPES_BOTH,
+    FILE_TYPES_RIB,
+    FILE_TYPES_UPDATE,
+)
+from mrt_downloader.concurrency import AdaptiveConcurrency
 from mrt_downloader.files import ByCollectorStrategy
-from mrt_downloader.http import DownloadWorker, RetryHelper
+from mrt_downloader.http import (
+    DownloadWorker,
+    IndexWorker,
+    RetryHelper,
+    build_session,
+    parse_last_modified,
+    read_etag,
+    write_response_body,
+)
 from mrt_downloader.mirrors import (
     ARCHIVE_MIRROR_POLICIES,
     file_url_alternatives,
@@ -32,11 +48,11 @@ RIS_COLLECTOR = CollectorInfo(
 
 
 class FakeContent:
-    def __init__(self, body: bytes):
-        self.body = body
+    def __init__(self, *chunks: bytes):
+        self.chunks = [chunk for chunk in chunks if chunk]
 
-    async def iter_chunked(self, _chunk_size: int):
-        yield self.body
+    async def readany(self) -> bytes:
+        return self.chunks.pop(0) if self.chunks else b""
 
 
 class FailingContent:
@@ -44,8 +60,10 @@ class FailingContent:
         self.body = body
         self.error = error
 
-    async def iter_chunked(self, _chunk_size: int):
-        yield self.body
+    async def readany(self) -> bytes:
+        if self.body:
+            body, self.body = self.body, b""
+            return body
         raise self.error
 
 
@@ -64,7 +82,8 @@ class FakeResponse:
         self.headers = headers or {}
         self.history = ()
         self.request_info = SimpleNamespace(real_url=url)
-        self.content = FakeContent(body)
+        self.charset = "utf-8"
+        self.content = FakeContent(body or text.encode())
         self._text = text
 
     async def __aenter__(self):
@@ -81,16 +100,11 @@ class FakeSession:
     def __init__(self, responses: dict[str, list[FakeResponse]]):
         self.responses = responses
         self.get_urls: list[str] = []
-        self.head_urls: list[str] = []
-        self.head_kwargs: list[dict[str, bool]] = []
+        self.get_headers: list[dict[str, str]] = []
 
-    def get(self, url: str) -> FakeResponse:
+    def get(self, url: str, headers: dict[str, str] | None = None) -> FakeResponse:
         self.get_urls.append(url)
-        return self.responses[url].pop(0)
-
-    def head(self, url: str, **kwargs: bool) -> FakeResponse:
-        self.head_urls.append(url)
-        self.head_kwargs.append(kwargs)
+        self.get_headers.append(headers or {})
         return self.responses[url].pop(0)
 
 
@@ -169,7 +183,7 @@ def test_routeviews_index_url_alternatives_stay_primary_only() -> None:
         collector=ROUTEVIEWS_COLLECTOR,
         url="https://archive.routeviews.org/route-views.bknix/bgpdata/2025.05/UPDATES/",
         time_period=datetime.datetime(2025, 5, 1, tzinfo=datetime.UTC),
-        file_types=frozenset(("update",)),
+        file_types=FILE_TYPES_UPDATE,
     )
 
     policy = ARCHIVE_MIRROR_POLICIES[index.collector.project]
@@ -248,7 +262,7 @@ async def test_retry_helper_retries_429_by_default() -> None:
     helper = RetryHelper(
         max_retries=1,
         initial_delay=2,
-        random_jitter=lambda delay: delay / 2,
+        random_uniform=lambda low, high: (low + high) / 2,
         sleep=sleep,
     )
 
@@ -267,7 +281,7 @@ async def test_retry_helper_retries_429_by_default() -> None:
 
     assert result == "https://api.routeviews.org/meta/collectors"
     assert attempts == 2
-    assert sleeps == [3.0]
+    assert sleeps == [4.0]
 
 
 @pytest.mark.asyncio
@@ -280,7 +294,7 @@ async def test_retry_helper_uses_retry_after_as_minimum_delay_for_429() -> None:
     helper = RetryHelper(
         max_retries=1,
         initial_delay=2,
-        random_jitter=lambda delay: delay,
+        random_uniform=lambda low, _high: low,
         sleep=sleep,
     )
 
@@ -294,7 +308,41 @@ async def test_retry_helper_uses_retry_after_as_minimum_delay_for_429() -> None:
             ("https://api.routeviews.org/meta/collectors",),
         )
 
-    assert sleeps == [10.0]
+    assert sleeps == [5.0]
+
+
+@pytest.mark.asyncio
+async def test_retry_helper_decorrelates_delays_up_to_max_delay() -> None:
+    sleeps: list[float] = []
+    bounds: list[tuple[float, float]] = []
+
+    async def sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    def uniform(low: float, high: float) -> float:
+        bounds.append((low, high))
+        return high
+
+    helper = RetryHelper(
+        max_retries=3,
+        initial_delay=2,
+        max_delay=10,
+        random_uniform=uniform,
+        sleep=sleep,
+    )
+
+    async def operation(url: str) -> str:
+        raise aiohttp.ServerDisconnectedError()
+
+    with pytest.raises(aiohttp.ServerDisconnectedError):
+        await helper.execute_with_urls(
+            operation,
+            "Download example",
+            ("https://data.ris.ripe.net/file",),
+        )
+
+    assert bounds == [(2, 6), (2, 18), (2, 30)]
+    assert sleeps == [6, 10, 10]
 
 
 @pytest.mark.asyncio
@@ -412,7 +460,7 @@ async def test_download_worker_retries_incomplete_payload_without_partial_target
 
 
 @pytest.mark.asyncio
-async def test_download_worker_retries_routeviews_head_on_secondary(
+async def test_download_worker_retries_routeviews_conditional_get_on_secondary(
     tmp_path: Path,
 ) -> None:
     osdf_url = (
@@ -427,18 +475,7 @@ async def test_download_worker_retries_routeviews_head_on_secondary(
     session = FakeSession(
         {
             osdf_url: [FakeResponse(osdf_url, 404)],
-            archive_url: [
-                FakeResponse(
-                    archive_url,
-                    200,
-                    headers={
-                        "Content-Length": "3",
-                        "Last-Modified": email.utils.format_datetime(
-                            last_modified, usegmt=True
-                        ),
-                    },
-                )
-            ],
+            archive_url: [FakeResponse(archive_url, 304)],
         }
     )
     entry = CollectorFileEntry(
@@ -464,15 +501,126 @@ async def test_download_worker_retries_routeviews_head_on_secondary(
         random_start=lambda _n: 2,
     )
 
-    await worker.download_file(entry)
+    assert await worker.download_file(entry) == 0
 
-    assert session.head_urls == [osdf_url, archive_url]
-    assert session.head_kwargs == [
-        {"allow_redirects": True},
-        {"allow_redirects": True},
+    assert session.get_urls == [osdf_url, archive_url]
+    assert [headers["If-Modified-Since"] for headers in session.get_headers] == [
+        "Thu, 01 May 2025 00:00:00 GMT",
+        "Thu, 01 May 2025 00:00:00 GMT",
     ]
+    assert target_file.read_bytes() == b"mrt"
+
+
+@pytest.mark.asyncio
+async def test_download_worker_sends_stored_validators(tmp_path: Path) -> None:
+    if not hasattr(os, "setxattr"):
+        pytest.skip("extended attributes are not supported on this platform")
+
+    url = "https://data.ris.ripe.net/rrc00/2025.05/updates.20250501.0000.gz"
+    session = FakeSession(
+        {
+            url: [
+                FakeResponse(
+                    url,
+                    200,
+                    body=b"mrt",
+                    headers={
+                        "ETag": '"abc"',
+                        "Last-Modified": "Thu, 01 May 2025 00:00:00 GMT",
+                    },
+                ),
+                FakeResponse(url, 304),
+            ]
+        }
+    )
+    entry = CollectorFileEntry(
+        collector=RIS_COLLECTOR,
+        filename="updates.20250501.0000.gz",
+        url=url,
+        file_type="update",
+    )
+    worker = DownloadWorker(
+        tmp_path,
+        ByCollectorStrategy(),
+        session,  # type: ignore[arg-type]
+        asyncio.Queue(),
+    )
+
+    assert await worker.download_file(entry) == 3
+    target_file = ByCollectorStrategy().get_path(tmp_path, entry)
+    if read_etag(target_file) is None:
+        pytest.skip("extended attributes are not supported on this filesystem")
+
+    # the stored validators survive a lost mtime (which also invalidates the
+    # freshness cache)
+    os.utime(target_file, (0, 0))
+    assert await worker.download_file(entry) == 0
+
+    assert session.get_headers[0] == {}
+    assert session.get_headers[1] == {
+        "If-Modified-Since": "Thu, 01 May 2025 00:00:00 GMT",
+        "If-None-Match": '"abc"',
+    }
+
+
+@pytest.mark.asyncio
+async def test_download_worker_assumes_old_files_immutable(tmp_path: Path) -> None:
+    url = "https://data.ris.ripe.net/rrc00/2025.05/updates.20250501.0000.gz"
+    session = FakeSession({url: [FakeResponse(url, 304)]})
+    entry = CollectorFileEntry(
+        collector=RIS_COLLECTOR,
+        filename="updates.20250501.0000.gz",
+        url=url,
+        file_type="update",
+    )
+    naming_strategy = ByCollectorStrategy()
+    target_file = naming_strategy.get_path(tmp_path, entry)
+    target_file.parent.mkdir(parents=True)
+    target_file.write_bytes(b"mrt")
+
+    worker = DownloadWorker(
+        tmp_path,
+        naming_strategy,
+        session,  # type: ignore[arg-type]
+        asyncio.Queue(),
+        assume_immutable_after=datetime.timedelta(days=7),
+    )
+    assert await worker.download_file(entry) == 0
     assert session.get_urls == []
 
+    # files newer than the cut-off are still checked
+    worker.assume_immutable_after = datetime.datetime.now(
+        datetime.UTC
+    ) - datetime.datetime(2025, 4, 1, tzinfo=datetime.UTC)
+    assert await worker.download_file(entry) == 0
+    assert session.get_urls == [url]
+
+
+@pytest.mark.asyncio
+async def test_download_worker_coalesces_concurrent_downloads(tmp_path: Path) -> None:
+    url = "https://data.ris.ripe.net/rrc00/2025.05/updates.20250501.0000.gz"
+    session = FakeSession({url: [FakeResponse(url, 200, body=b"mrt")]})
+    entry = CollectorFileEntry(
+        collector=RIS_COLLECTOR,
+        filename="updates.20250501.0000.gz",
+        url=url,
+        file_type="update",
+    )
+    worker = DownloadWorker(
+        tmp_path,
+        ByCollectorStrategy(),
+        session,  # type: ignore[arg-type]
+        asyncio.Queue(),
+    )
+
+    written = await asyncio.gather(
+        worker.download_file(entry), worker.download_file(entry)
+    )
+
+    assert sorted(written) == [0, 3]
+    assert session.get_urls == [url]
+    assert worker._inflight == {}
+
 
 @pytest.mark.asyncio
 async def test_download_worker_does_not_retry_ris_404(tmp_path: Path) -> None:
@@ -496,3 +644,486 @@ async def test_download_worker_does_not_retry_ris_404(tmp_path: Path) -> None:
         await worker.download_file(entry)
 
     assert session.get_urls == [url]
+
+
+@pytest.mark.asyncio
+async def test_download_worker_shrinks_concurrency_on_429(tmp_path: Path) -> None:
+    url = "https://data.ris.ripe.net/rrc00/2025.05/updates.20250501.0000.gz"
+    session = FakeSession(
+        {
+            url: [
+                FakeResponse(url, 429),
+                FakeResponse(url, 200, body=b"mrt"),
+            ]
+        }
+    )
+    entry = CollectorFileEntry(
+        collector=RIS_COLLECTOR,
+        filename="updates.20250501.0000.gz",
+        url=url,
+        file_type="update",
+    )
+    concurrency = AdaptiveConcurrency(initial=8)
+    worker = DownloadWorker(
+        tmp_path,
+        ByCollectorStrategy(),
+        session,  # type: ignore[arg-type]
+        asyncio.Queue(),
+        concurrency=concurrency,
+    )
+    worker.retry_helper = RetryHelper(
+        max_retries=1, initial_delay=0, on_retry=worker._on_retry
+    )
+
+    assert await worker.download_file(entry) == 3
+    assert concurrency.window == 4
+
+
+@pytest.mark.asyncio
+async def test_download_workers_consume_queue_until_cancelled(tmp_path: Path) -> None:
+    urls = [
+        f"https://data.ris.ripe.net/rrc00/2025.05/updates.20250501.00{minute:02}.gz"
+        for minute in (0, 5, 10)
+    ]
+    session = FakeSession({url: [FakeResponse(url, 200, body=b"mrt")] for url in urls})
+    queue: asyncio.Queue[CollectorFileEntry] = asyncio.Queue()
+    worker = DownloadWorker(
+        tmp_path,
+        ByCollectorStrategy(),
+        session,  # type: ignore[arg-type]
+        queue,
+    )
+    tasks = [asyncio.create_task(worker.run()) for _ in range(2)]
+
+    # workers keep waiting on an empty queue for entries that are added later
+    await asyncio.sleep(0)
+    for url in urls:
+        queue.put_nowait(
+            CollectorFileEntry(
+                collector=RIS_COLLECTOR,
+                filename=url.rsplit("/", 1)[1],
+                url=url,
+                file_type="update",
+            )
+        )
+    await queue.join()
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert worker.processed == 3
+    assert sorted(session.get_urls) == urls
+    # all files are in the same directory, it is created once
+    assert worker._created_dirs == {tmp_path / "rrc00"}
+
+
+@pytest.mark.asyncio
+async def test_download_worker_reports_finished_files(tmp_path: Path) -> None:
+    ok_url = "https://data.ris.ripe.net/rrc00/2025.05/updates.20250501.0000.gz"
+    missing_url = "https://data.ris.ripe.net/rrc00/2025.05/updates.20250501.0005.gz"
+    session = FakeSession(
+        {
+            ok_url: [FakeResponse(ok_url, 200, body=b"mrt")],
+            missing_url: [FakeResponse(missing_url, 404)],
+        }
+    )
+    queue: asyncio.Queue[CollectorFileEntry] = asyncio.Queue()
+    done: asyncio.Queue[Path | None] = asyncio.Queue()
+    worker = DownloadWorker(
+        tmp_path,
+        ByCollectorStrategy(),
+        session,  # type: ignore[arg-type]
+        queue,
+        out_queue=done,
+    )
+    worker.retry_helper = RetryHelper(max_retries=1, initial_delay=0)
+    for url in (ok_url, missing_url):
+        queue.put_nowait(
+            CollectorFileEntry(
+                collector=RIS_COLLECTOR,
+                filename=url.rsplit("/", 1)[1],
+                url=url,
+                file_type="update",
+            )
+        )
+
+    task = asyncio.create_task(worker.run())
+    await queue.join()
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    # the failed download is not reported
+    assert done.qsize() == 1
+    assert done.get_nowait() == tmp_path / "rrc00" / "updates.20250501.0000.gz"
+
+
+@pytest.mark.asyncio
+async def test_index_worker_processes_entries_once(tmp_path: Path) -> None:
+    url = "https://data.ris.ripe.net/rrc00/2025.05/"
+    session = FakeSession(
+        {
+            url: [
+                FakeResponse(
+                    url,
+                    200,
+                    text='<a href="updates.20250501.0000.gz">updates</a>',
+                )
+            ]
+        }
+    )
+    worker = IndexWorker(
+        session,  # type: ignore[arg-type]
+        [
+            CollectorIndexEntry(
+                collector=RIS_COLLECTOR,
+                url=url,
+                time_period=datetime.datetime(2025, 5, 1, tzinfo=datetime.UTC),
+                file_types=FILE_TYPES_BOTH,
+            ),
+            CollectorIndexEntry(
+                collector=ROUTEVIEWS_COLLECTOR,
+                url="https://archive.routeviews.org/route-views.bknix/bgpdata/2025.05/RIBS/",
+                time_period=datetime.datetime(2025, 5, 1, tzinfo=datetime.UTC),
+                file_types=FILE_TYPES_RIB,
+            ),
+        ],
+        file_types=FILE_TYPES_UPDATE,
+        db_path=tmp_path / "state.sqlite3",
+    )
+
+    assert await worker.run() == 1
+    assert await worker.run() == 0
+
+    assert session.get_urls == [url]
+    assert [entry.filename for entry in worker.results] == ["updates.20250501.0000.gz"]
+
+
+@pytest.mark.asyncio
+async def test_index_worker_falls_back_to_utf8_for_unknown_charset(
+    tmp_path: Path,
+) -> None:
+    url = "https://data.ris.ripe.net/rrc00/2025.05/"
+    response = FakeResponse(
+        url, 200, text='<a href="updates.20250501.0000.gz">updates</a>'
+    )
+    response.charset = "x-unknown-charset"
+    session = FakeSession({url: [response]})
+    worker = IndexWorker(
+        session,  # type: ignore[arg-type]
+        [
+            CollectorIndexEntry(
+                collector=RIS_COLLECTOR,
+                url=url,
+                time_period=datetime.datetime(2025, 5, 1, tzinfo=datetime.UTC),
+                file_types=FILE_TYPES_BOTH,
+            )
+        ],
+        db_path=tmp_path / "state.sqlite3",
+    )
+
+    assert await worker.run() == 1
+    assert [entry.filename for entry in worker.results] == ["updates.20250501.0000.gz"]
+
+
+@pytest.mark.asyncio
+async def test_index_worker_fetch_all_bounds_concurrency(tmp_path: Path) -> None:
+    running = 0
+    peak = 0
+
+    class SlowResponse(FakeResponse):
+        async def __aenter__(self):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            return self
+
+        async def __aexit__(self, _exc_type, _exc, _tb):
+            nonlocal running
+            running -= 1
+
+    collectors = [f"rrc{n:02}" for n in range(5)]
+    urls = [f"https://data.ris.ripe.net/{name}/2025.05/" for name in collectors]
+    session = FakeSession(
+        {
+            url: [
+                SlowResponse(
+                    url, 200, text='<a href="updates.20250501.0000.gz">updates</a>'
+                )
+            ]
+            for url in urls
+        }
+    )
+    worker = IndexWorker(
+        session,  # type: ignore[arg-type]
+        [],
+        db_path=tmp_path / "state.sqlite3",
+    )
+    entries = [
+        CollectorIndexEntry(
+            collector=RIS_COLLECTOR,
+            url=url,
+            time_period=datetime.datetime(2025, 5, 1, tzinfo=datetime.UTC),
+            file_types=FILE_TYPES_BOTH,
+        )
+        for url in urls
+    ]
+
+    file_entries = await worker.fetch_all(entries, concurrency=2)
+
+    assert peak == 2
+    assert sorted(session.get_urls) == urls
+    assert [entry.url for entry in file_entries] == [
+        f"{url}updates.20250501.0000.gz" for url in urls
+    ]
+    assert len(worker.results) == 5
+
+
+@pytest.mark.asyncio
+async def test_index_worker_queues_selected_entries(tmp_path: Path) -> None:
+    url = "https://data.ris.ripe.net/rrc00/2025.05/"
+    session = FakeSession(
+        {
+            url: [
+                FakeResponse(
+                    url,
+                    200,
+                    text=(
+                        '<a href="updates.20250501.0000.gz">updates</a>'
+                        '<a href="updates.20250501.0005.gz">updates</a>'
+                    ),
+                )
+            ]
+        }
+    )
+    queue: asyncio.Queue[CollectorFileEntry] = asyncio.Queue()
+    worker = IndexWorker(
+        session,  # type: ignore[arg-type]
+        [
+            CollectorIndexEntry(
+                collector=RIS_COLLECTOR,
+                url=url,
+                time_period=datetime.datetime(2025, 5, 1, tzinfo=datetime.UTC),
+                file_types=FILE_TYPES_BOTH,
+            ),
+        ],
+        file_types=FILE_TYPES_UPDATE,
+        db_path=tmp_path / "state.sqlite3",
+        out_queue=queue,
+        select=lambda entries: entries[1:],
+    )
+
+    assert await worker.run() == 1
+
+    assert len(worker.results) == 2
+    assert queue.get_nowait().filename == "updates.20250501.0005.gz"
+    assert queue.empty()
+
+
+def test_drop_page_cache_accepts_files_without_descriptor(tmp_path: Path) -> None:
+    # BytesIO has no fileno(), the sync and advice are skipped
+    http_module.drop_page_cache(io.BytesIO(b"mrt"))
+
+
+@pytest.mark.asyncio
+async def test_download_worker_syncs_before_dropping_page_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    if not hasattr(os, "fdatasync") or not hasattr(os, "posix_fadvise"):
+        pytest.skip("fdatasync/posix_fadvise are not available on this platform")
+
+    calls: list[tuple[str, bool]] = []
+    loop_thread = threading.get_ident()
+
+    def record(name: str, original):
+        def wrapper(fd: int, *args) -> None:
+            calls.append((name, threading.get_ident() == loop_thread))
+            original(fd, *args)
+
+        return wrapper
+
+    monkeypatch.setattr(os, "fdatasync", record("fdatasync", os.fdatasync))
+    monkeypatch.setattr(os, "posix_fadvise", record("fadvise", os.posix_fadvise))
+
+    url = "https://data.ris.ripe.net/rrc00/2025.05/updates.20250501.0000.gz"
+    session = FakeSession({url: [FakeResponse(url, 200, body=b"mrt")]})
+    entry = CollectorFileEntry(
+        collector=RIS_COLLECTOR,
+        filename="updates.20250501.0000.gz",
+        url=url,
+        file_type="update",
+    )
+    worker = DownloadWorker(
+        tmp_path,
+        ByCollectorStrategy(),
+        session,  # type: ignore[arg-type]
+        asyncio.Queue(),
+    )
+
+    assert await worker.download_file(entry) == 3
+
+    # the pages are clean when the advice is given, and neither blocks the loop
+    assert calls == [("fdatasync", False), ("fadvise", False)]
+    assert ByCollectorStrategy().get_path(tmp_path, entry).read_bytes() == b"mrt"
+
+
+def test_timestamp_ns_is_exact() -> None:
+    value = datetime.datetime(2025, 5, 1, 12, 0, 0, 123456, tzinfo=datetime.UTC)
+
+    assert http_module.timestamp_ns(value) == 1_746_100_800_123_456_000
+    assert http_module.timestamp_ns(http_module.EPOCH) == 0
+
+
+def test_parse_last_modified_parses_each_value_once() -> None:
+    http_module._parse_http_date.cache_clear()
+
+    def last_modified(headers: dict[str, str]) -> datetime.datetime | None:
+        return parse_last_modified(SimpleNamespace(headers=headers))  # type: ignore[arg-type]
+
+    for _ in range(3):
+        assert last_modified(
+            {"Last-Modified": "Thu, 01 May 2025 00:00:00 GMT"}
+        ) == datetime.datetime(2025, 5, 1, tzinfo=datetime.UTC)
+    assert last_modified({"Last-Modified": "never"}) is None
+    assert last_modified({}) is None
+
+    cache_info = http_module._parse_http_date.cache_info()
+    assert (cache_info.hits, cache_info.misses) == (2, 2)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "Thu, 01 May 2025 00:00:00 GMT",
+        # asctime form, which recipients must accept (RFC 9110)
+        "Thu May  1 00:00:00 2025",
+        "Thu, 01 May 2025 00:00:00 -0000",
+    ],
+)
+def test_parse_last_modified_is_utc(value: str) -> None:
+    parsed = parse_last_modified(
+        SimpleNamespace(headers={"Last-Modified": value})  # type: ignore[arg-type]
+    )
+
+    assert parsed == datetime.datetime(2025, 5, 1, tzinfo=datetime.UTC)
+    assert parsed is not None and parsed.tzinfo is not None
+
+
+@pytest.mark.asyncio
+async def test_download_worker_sets_mtime_from_asctime_last_modified(
+    tmp_path: Path,
+) -> None:
+    url = "https://data.ris.ripe.net/rrc00/2025.05/updates.20250501.0000.gz"
+    session = FakeSession(
+        {
+            url: [
+                FakeResponse(
+                    url,
+                    200,
+                    body=b"mrt",
+                    headers={"Last-Modified": "Thu May  1 00:00:00 2025"},
+                )
+            ]
+        }
+    )
+    entry = CollectorFileEntry(
+        collector=RIS_COLLECTOR,
+        filename="updates.20250501.0000.gz",
+        url=url,
+        file_type="update",
+    )
+    worker = DownloadWorker(
+        tmp_path,
+        ByCollectorStrategy(),
+        session,  # type: ignore[arg-type]
+        asyncio.Queue(),
+    )
+
+    assert await worker.download_file(entry) == 3
+    target_file = ByCollectorStrategy().get_path(tmp_path, entry)
+    assert target_file.stat().st_mtime_ns == 1_746_057_600_000_000_000
+
+
+@pytest.mark.asyncio
+async def test_build_session_shares_tuned_connection_pool() -> None:
+    async with build_session(max_per_host=8) as session:
+        connector = session.connector
+        assert isinstance(connector, aiohttp.TCPConnector)
+        assert connector.limit == http_module.MAX_CONNECTIONS
+        assert connector.limit_per_host == 8
+        assert not connector.force_close
+
+    async with build_session(force_close=True) as session:
+        assert session.connector is not None
+        assert session.connector.force_close
+
+
+@pytest.mark.asyncio
+async def test_write_response_body_writes_chunks_in_order(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(http_module, "WRITE_BUFFER_SIZE", 4)
+    response = SimpleNamespace(content=FakeContent(b"ab", b"cde", b"f", b"gh"))
+    f = io.BytesIO()
+
+    written = await write_response_body(response, f)  # type: ignore[arg-type]
+
+    assert written == 8
+    assert f.getvalue() == b"abcdefgh"
+
+
+@pytest.mark.asyncio
+async def test_write_response_body_does_not_copy_chunks() -> None:
+    chunks = [b"ab" * 1024, b"cde" * 1024]
+    response = SimpleNamespace(content=FakeContent(*chunks))
+    written_chunks: list[bytes] = []
+
+    class RecordingFile(io.BytesIO):
+        def writelines(self, lines) -> None:  # type: ignore[override]
+            written_chunks.extend(lines)
+
+    await write_response_body(response, RecordingFile())  # type: ignore[arg-type]
+
+    assert [id(chunk) for chunk in written_chunks] == [id(chunk) for chunk in chunks]
+
+
+@pytest.mark.asyncio
+async def test_download_worker_skips_request_for_recently_verified_file(
+    tmp_path: Path,
+) -> None:
+    url = "https://data.ris.ripe.net/rrc00/2025.05/updates.20250501.0000.gz"
+    last_modified = datetime.datetime(2025, 5, 1, tzinfo=datetime.UTC)
+    session = FakeSession(
+        {
+            url: [FakeResponse(url, 304)],
+        }
+    )
+    entry = CollectorFileEntry(
+        collector=RIS_COLLECTOR,
+        filename="updates.20250501.0000.gz",
+        url=url,
+        file_type="update",
+    )
+    naming_strategy = ByCollectorStrategy()
+    target_file = naming_strategy.get_path(tmp_path, entry)
+    target_file.parent.mkdir(parents=True)
+    target_file.write_bytes(b"mrt")
+    os.utime(target_file, (last_modified.timestamp(), last_modified.timestamp()))
+    worker = DownloadWorker(
+        tmp_path,
+        naming_strategy,
+        session,  # type: ignore[arg-type]
+        asyncio.Queue(),
+    )
+
+    assert await worker.download_file(entry) == 0
+    assert await worker.download_file(entry) == 0
+
+    assert session.get_urls == [url]
+
+    # a local modification invalidates the cached verification
+    target_file.write_bytes(b"other")
+    session.responses[url] = [FakeResponse(url, 200, body=b"mrt")]
+    assert await worker.download_file(entry) == 3
+    assert session.get_urls == [url, url]
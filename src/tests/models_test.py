@@ -0,0 +1,80 @@
+import dataclasses
+import datetime
+
+import pytest
+
+from mrt_downloader.models import (
+    CollectorFileEntry,
+    CollectorInfo,
+    parse_mrt_filename_date,
+)
+
+RIS_COLLECTOR = CollectorInfo(
+    name="rrc00",
+    project="ris",
+    base_url="https://data.ris.ripe.net/rrc00/",
+    installed=datetime.datetime(1999, 10, 1, tzinfo=datetime.UTC),
+)
+
+
+@pytest.mark.parametrize(
+    "filename,expected",
+    [
+        (
+            "updates.20250501.1235.gz",
+            datetime.datetime(2025, 5, 1, 12, 35, tzinfo=datetime.UTC),
+        ),
+        ("bview.20250501.0000.gz", datetime.datetime(2025, 5, 1, tzinfo=datetime.UTC)),
+        (
+            "rib.20250501.0800.bz2",
+            datetime.datetime(2025, 5, 1, 8, tzinfo=datetime.UTC),
+        ),
+        ("updates.20251301.0000.gz", None),
+        ("updates.20250501.2460.gz", None),
+        ("updates.2025051.0000.gz", None),
+        ("updates.20250501.0000.xz", None),
+    ],
+)
+def test_parse_mrt_filename_date(
+    filename: str, expected: datetime.datetime | None
+) -> None:
+    assert parse_mrt_filename_date(filename) == expected
+
+
+def test_collector_file_entry_date() -> None:
+    entry = CollectorFileEntry(
+        collector=RIS_COLLECTOR,
+        filename="updates.20250501.0005.gz",
+        url="https://data.ris.ripe.net/rrc00/2025.05/updates.20250501.0005.gz",
+    )
+
+    assert entry.date == datetime.datetime(2025, 5, 1, 0, 5, tzinfo=datetime.UTC)
+    assert entry.date is entry.date
+
+    invalid = CollectorFileEntry(
+        collector=RIS_COLLECTOR,
+        filename="updates.latest.gz",
+        url="https://data.ris.ripe.net/rrc00/updates.latest.gz",
+    )
+    with pytest.raises(ValueError):
+        invalid.date
+
+
+def test_collector_file_entry_is_hashable_and_frozen() -> None:
+    entry = CollectorFileEntry(
+        collector=RIS_COLLECTOR,
+        filename="updates.20250501.0005.gz",
+        url="https://data.ris.ripe.net/rrc00/2025.05/updates.20250501.0005.gz",
+    )
+    same = CollectorFileEntry(
+        collector=RIS_COLLECTOR,
+        filename="updates.20250501.0005.gz",
+        url="https://data.ris.ripe.net/rrc00/2025.05/updates.20250501.0005.gz",
+    )
+    # the cached date does not affect equality
+    entry.date
+
+    assert entry == same
+    assert len({entry, same}) == 1
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        entry.url = "https://example.org/"  # type: ignore[misc]